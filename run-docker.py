@@ -6,22 +6,20 @@ Simple script to build and run WABE in Docker with proper configuration.
 
 import argparse
 import os
+import re
+import shutil
 import subprocess
 import sys
 from pathlib import Path
 
+# GOOGLE_API_KEY=<value> assignments in .env, one per line
+_API_KEY_RE = re.compile(rb"(?m)^GOOGLE_API_KEY=([^\r\n]+)")
+
 
 def check_docker():
-    """Check if Docker is installed and running."""
-    try:
-        subprocess.run(
-            ["docker", "--version"],
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print("❌ Error: Docker is not installed or not running")
+    """Check if Docker is installed."""
+    if shutil.which("docker") is None:
+        print("❌ Error: Docker is not installed (no docker on PATH)")
         print("   Install Docker: https://docs.docker.com/get-docker/")
         sys.exit(1)
 
@@ -34,14 +32,12 @@ def check_api_key():
 
     # Check .env file
     env_file = Path(".env")
-    if env_file.exists():
-        with open(env_file) as f:
-            for line in f:
-                if line.startswith("GOOGLE_API_KEY=") and "=" in line:
-                    _, value = line.split("=", 1)
-                    if value.strip() and not value.strip().startswith("your_"):
-                        return True
-
+    if not env_file.exists():
+        return False
+    for match in _API_KEY_RE.finditer(env_file.read_bytes()):
+        value = match.group(1).strip()
+        if value and not value.startswith(b"your_"):
+            return True
     return False
 
 
@@ -3,10 +3,11 @@ White Agent Registry - Pluggable directory convention for white agents.
 
 Each agent is a standalone Python file with a main() entry point that serves
 an A2A-compatible agent via uvicorn. Agents share the create_agent_card()
-helper for consistent agent card creation.
+helper for consistent agent card creation and run_agent_server() to serve.
 
 Available agents:
     - adk_default: Google ADK Agent with Gemini Flash (original white agent)
+    - react_adk: Google ADK Agent with Observe→Think→Act (ReAct) instructions
     - reliability: Deterministic replay agent for benchmark reliability testing
     - langgraph: LangGraph ReAct agent (WIP - needs refactor for Docker/leaderboard)
 """
@@ -14,16 +15,33 @@ Available agents:
 import argparse
 import asyncio
 import logging
+import os
 import random
+import re
 import time
-from collections.abc import AsyncGenerator
-from functools import wraps
+from collections.abc import AsyncGenerator, Awaitable
+from functools import cached_property, lru_cache, wraps
 from typing import Any, Callable
 
+import httpx
+import uvicorn
 from a2a.types import AgentCapabilities, AgentCard
+from aiolimiter import AsyncLimiter
 from google.adk.models import BaseLlm, Gemini
 from google.adk.models.llm_request import LlmRequest
 from google.adk.models.llm_response import LlmResponse
+from google.genai import Client, types
+from pydantic import PrivateAttr
+
+__all__ = [
+    "DETERMINISTIC_CONFIG",
+    "LLM_TOTAL_TIMEOUT",
+    "RetryGemini",
+    "create_agent_card",
+    "create_base_arg_parser",
+    "retry_on_rate_limit",
+    "run_agent_server",
+]
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +49,117 @@ logger = logging.getLogger(__name__)
 # This is separate from per-request timeouts and covers the entire retry loop
 LLM_TOTAL_TIMEOUT = 180  # 3 minutes max for entire LLM call including retries
 
+# Greedy, seeded decoding shared by the Gemini-backed agents. ADK deep-copies
+# an agent's generate_content_config into each request, so one instance is
+# safe to share.
+DETERMINISTIC_CONFIG = types.GenerateContentConfig(
+    temperature=0.0,
+    top_p=0.0,
+    top_k=1,
+    seed=42,
+)
+
+# Client-side Gemini quota pacing for RetryGemini, per minute; 0 disables.
+# Set these to ~90% of the project's RPM/TPM quota so calls are spread out
+# instead of hitting 429 and sleeping through the backoff.
+GEMINI_RPM_LIMIT = int(os.getenv("GEMINI_RPM_LIMIT", "0"))
+GEMINI_TPM_LIMIT = int(os.getenv("GEMINI_TPM_LIMIT", "0"))
+
+# Connection pool for Gemini API calls. Agent steps are often more than
+# httpx's default 5s keep-alive apart (the green agent runs browser actions
+# in between), so idle connections are kept longer to skip a TLS handshake
+GEMINI_HTTP_LIMITS = httpx.Limits(
+    max_connections=64,
+    max_keepalive_connections=32,
+    keepalive_expiry=60.0,
+)
+
+# Rough prompt size estimate used against the TPM limit
+_CHARS_PER_TOKEN = 4
+_TOKENS_PER_IMAGE = 258
+
+# Matches rate limit / quota errors: 429, RESOURCE_EXHAUSTED, quota, or
+# "rate" and "limit" anywhere in the message
+_is_rate_limit_error = re.compile(
+    r"429|resource_exhausted|quota|rate.*limit|limit.*rate",
+    re.IGNORECASE | re.DOTALL,
+).search
+
+
+def _backoff_delays(
+    max_retries: int, base_delay: float, max_delay: float
+) -> list[float]:
+    """Exponential backoff delays (before jitter) for each retry attempt."""
+    return [min(base_delay * (2**attempt), max_delay) for attempt in range(max_retries)]
+
+
+async def _retry_backoff(
+    call_factory: Callable[[], Awaitable[Any]],
+    *,
+    delays: list[float],
+    jitter: float,
+    total_timeout: float,
+    label: str = "Function call",
+) -> Any:
+    """
+    Await call_factory(), retrying on rate limit errors with backoff.
+
+    Args:
+        call_factory: Returns a fresh awaitable for each attempt
+        delays: Base delay before each retry (see _backoff_delays)
+        jitter: Random jitter factor (0-1) to add to delays
+        total_timeout: Maximum total time for all attempts
+        label: Name of the call used in timeout messages
+
+    Returns:
+        Result of the first successful attempt
+    """
+    start_time = time.monotonic()
+    max_attempts = len(delays) + 1
+
+    # try is zero-cost on the success path, so the first attempt returns
+    # straight out of the loop without touching any retry state
+    for attempt, base in enumerate(delays, start=1):
+        try:
+            return await call_factory()
+        except Exception as e:
+            if not _is_rate_limit_error(str(e)):
+                raise
+
+            # Exponential backoff with jitter
+            delay = base * (1.0 + random.random() * jitter)
+
+            # Check if delay would exceed total timeout
+            elapsed = time.monotonic() - start_time
+            remaining = total_timeout - elapsed
+            if delay > remaining:
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"{label} exceeded total timeout of {total_timeout}s. "
+                        f"Rate limit error: {e}"
+                    ) from e
+                delay = remaining
+
+            logger.warning(
+                "Rate limit hit (attempt %d/%d), retrying in %.1fs (elapsed: %.1fs): %.100s",
+                attempt,
+                max_attempts,
+                delay,
+                elapsed,
+                e,
+            )
+            await asyncio.sleep(delay)
+
+            # Check total timeout before the next attempt
+            if time.monotonic() - start_time >= total_timeout:
+                raise TimeoutError(
+                    f"{label} exceeded total timeout of {total_timeout}s "
+                    f"after {attempt} attempts. Last error: {e}"
+                ) from e
+
+    # Final attempt: any error propagates unchanged
+    return await call_factory()
+
 
 def retry_on_rate_limit(
     max_retries: int = 3,
@@ -55,70 +184,57 @@ def retry_on_rate_limit(
     Returns:
         Decorated function with retry logic
     """
+    delays = _backoff_delays(max_retries, base_delay, max_delay)
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         @wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
-            last_exception: Exception | None = None
-            start_time = time.monotonic()
-
-            for attempt in range(max_retries + 1):
-                # Check total timeout before each attempt
-                elapsed = time.monotonic() - start_time
-                if elapsed >= total_timeout:
-                    raise TimeoutError(
-                        f"Function call exceeded total timeout of {total_timeout}s "
-                        f"after {attempt} attempts. Last error: {last_exception}"
-                    )
-
-                try:
-                    return await func(*args, **kwargs)
-                except Exception as e:
-                    error_str = str(e).lower()
-                    is_rate_limit = (
-                        "429" in error_str
-                        or "resource_exhausted" in error_str
-                        or ("rate" in error_str and "limit" in error_str)
-                        or "quota" in error_str
-                    )
-
-                    if not is_rate_limit or attempt == max_retries:
-                        raise
-
-                    last_exception = e
-
-                    # Exponential backoff with jitter
-                    delay = min(base_delay * (2**attempt), max_delay)
-                    delay += random.uniform(0, delay * jitter)
-
-                    # Check if delay would exceed total timeout
-                    elapsed = time.monotonic() - start_time
-                    remaining = total_timeout - elapsed
-                    if delay > remaining:
-                        if remaining > 0:
-                            delay = remaining
-                        else:
-                            raise TimeoutError(
-                                f"Function call exceeded total timeout of {total_timeout}s. "
-                                f"Rate limit error: {e}"
-                            )
-
-                    logger.warning(
-                        f"Rate limit hit (attempt {attempt + 1}/{max_retries + 1}), "
-                        f"retrying in {delay:.1f}s (elapsed: {elapsed:.1f}s): {str(e)[:100]}"
-                    )
-                    await asyncio.sleep(delay)
-
-            # Should not reach here, but just in case
-            if last_exception:
-                raise last_exception
-            raise RuntimeError("Retry loop exited unexpectedly")
+            return await _retry_backoff(
+                lambda: func(*args, **kwargs),
+                delays=delays,
+                jitter=jitter,
+                total_timeout=total_timeout,
+            )
 
         return wrapper
 
     return decorator
 
 
+def _estimate_tokens(llm_request: LlmRequest) -> int:
+    """Approximate input tokens of a request from its text and image parts."""
+    chars = 0
+    images = 0
+    for content in llm_request.contents:
+        for part in content.parts or ():
+            if part.text:
+                chars += len(part.text)
+            elif part.inline_data is not None:
+                images += 1
+    return chars // _CHARS_PER_TOKEN + images * _TOKENS_PER_IMAGE + 1
+
+
+@lru_cache(maxsize=1)
+def _gemini_supported_models() -> tuple[str, ...]:
+    """Gemini's supported model patterns, looked up once per process."""
+    return tuple(Gemini.supported_models())
+
+
+class _PooledGemini(Gemini):
+    """Gemini whose API client uses the GEMINI_HTTP_LIMITS connection pool."""
+
+    @cached_property
+    def api_client(self) -> Client:
+        """Same client ADK builds, with the pool limits for async calls."""
+        return Client(
+            http_options=types.HttpOptions(
+                headers=self._tracking_headers,
+                retry_options=self.retry_options,
+                async_client_args={"limits": GEMINI_HTTP_LIMITS},
+            )
+        )
+
+
 class RetryGemini(BaseLlm):
     """
     Gemini LLM wrapper with automatic retry on rate limit errors.
@@ -134,84 +250,71 @@ class RetryGemini(BaseLlm):
     max_delay: float = 30.0  # Reduced from 120s to prevent long waits
     jitter: float = 0.5
     total_timeout: float = LLM_TOTAL_TIMEOUT  # Total time allowed for all retries
-    _inner: Gemini | None = None
+    requests_per_minute: int = GEMINI_RPM_LIMIT  # 0 disables request pacing
+    tokens_per_minute: int = GEMINI_TPM_LIMIT  # 0 disables token pacing
+    # Created on first use in generate_content_async
+    _inner: _PooledGemini | None = PrivateAttr(default=None)
+    _delays: list[float] = PrivateAttr(default_factory=list)
+    _rpm_limiter: AsyncLimiter | None = PrivateAttr(default=None)
+    _tpm_limiter: AsyncLimiter | None = PrivateAttr(default=None)
 
     def model_post_init(self, __context: Any) -> None:
-        """Initialize the inner Gemini model after pydantic initialization."""
-        self._inner = Gemini(model=self.model)
+        """Precompute backoff delays and rate limiters after initialization."""
+        self._delays = _backoff_delays(
+            self.max_retries, self.base_delay, self.max_delay
+        )
+        if self.requests_per_minute > 0:
+            self._rpm_limiter = AsyncLimiter(self.requests_per_minute, 60)
+        if self.tokens_per_minute > 0:
+            self._tpm_limiter = AsyncLimiter(self.tokens_per_minute, 60)
+
+    async def _acquire_quota(self, llm_request: LlmRequest) -> None:
+        """Wait until the request fits within the configured RPM/TPM limits."""
+        if self._rpm_limiter is not None:
+            await self._rpm_limiter.acquire()
+        if self._tpm_limiter is not None:
+            tokens = min(_estimate_tokens(llm_request), self.tokens_per_minute)
+            await self._tpm_limiter.acquire(tokens)
 
     @classmethod
     def supported_models(cls) -> list[str]:
         """Return supported model patterns."""
-        return Gemini.supported_models()
+        return list(_gemini_supported_models())
 
     async def generate_content_async(
         self, llm_request: LlmRequest, stream: bool = False
     ) -> AsyncGenerator[LlmResponse, None]:
         """Generate content with retry logic for rate limits.
 
-        Includes a total timeout to prevent the job from appearing stale
-        in CI environments like GitHub Actions.
+        Only opening the stream (up to the first response) is retried; once a
+        response has been yielded, later errors propagate so partial output
+        is never replayed. Each attempt first waits for RPM/TPM capacity when
+        limits are configured. Includes a total timeout to prevent the job
+        from appearing stale in CI environments like GitHub Actions.
         """
         if self._inner is None:
-            self._inner = Gemini(model=self.model)
-
-        last_exception: Exception | None = None
-        start_time = time.monotonic()
-
-        for attempt in range(self.max_retries + 1):
-            # Check total timeout before each attempt
-            elapsed = time.monotonic() - start_time
-            if elapsed >= self.total_timeout:
-                raise TimeoutError(
-                    f"LLM call exceeded total timeout of {self.total_timeout}s "
-                    f"after {attempt} attempts. Last error: {last_exception}"
-                )
-
-            try:
-                async for response in self._inner.generate_content_async(
-                    llm_request, stream=stream
-                ):
-                    yield response
-                return  # Success, exit retry loop
-            except Exception as e:
-                error_str = str(e).lower()
-                is_rate_limit = (
-                    "429" in error_str
-                    or "resource_exhausted" in error_str
-                    or ("rate" in error_str and "limit" in error_str)
-                    or "quota" in error_str
-                )
-
-                if not is_rate_limit or attempt == self.max_retries:
-                    raise
-
-                last_exception = e
-
-                # Exponential backoff with jitter
-                delay = min(self.base_delay * (2**attempt), self.max_delay)
-                delay += random.uniform(0, delay * self.jitter)
-
-                # Check if delay would exceed total timeout
-                elapsed = time.monotonic() - start_time
-                remaining = self.total_timeout - elapsed
-                if delay > remaining:
-                    if remaining > 0:
-                        delay = remaining  # Use remaining time
-                    else:
-                        raise TimeoutError(
-                            f"LLM call exceeded total timeout of {self.total_timeout}s. "
-                            f"Rate limit error: {e}"
-                        )
-
-                logger.warning(
-                    f"Rate limit hit (attempt {attempt + 1}/{self.max_retries + 1}), "
-                    f"retrying in {delay:.1f}s (elapsed: {elapsed:.1f}s): {str(e)[:100]}"
-                )
-                await asyncio.sleep(delay)
-
-        if last_exception:
-            raise last_exception
+            self._inner = _PooledGemini(model=self.model)
+
+        responses: AsyncGenerator[LlmResponse, None] | None = None
+
+        async def start_stream() -> LlmResponse | None:
+            nonlocal responses
+            await self._acquire_quota(llm_request)
+            responses = self._inner.generate_content_async(llm_request, stream=stream)
+            return await anext(responses, None)
+
+        first = await _retry_backoff(
+            start_stream,
+            delays=self._delays,
+            jitter=self.jitter,
+            total_timeout=self.total_timeout,
+            label="LLM call",
+        )
+        if first is None:
+            return
+        yield first
+        async for response in responses:
+            yield response
 
 
 def create_agent_card(
@@ -250,6 +353,30 @@ def create_agent_card(
     )
 
 
+def run_agent_server(app: Any, host: str, port: int) -> None:
+    """
+    Serve a white agent's A2A application with uvicorn.
+
+    uvicorn's "auto" loop/http settings pick uvloop and httptools (both
+    project dependencies) when available. Per-request access logs are off
+    and uvicorn's own logging is limited to warnings.
+
+    Args:
+        app: ASGI application (e.g. from to_a2a)
+        host: Host to bind the server
+        port: Port to bind the server
+    """
+    uvicorn.run(
+        app,
+        host=host,
+        port=port,
+        loop="auto",
+        http="auto",
+        access_log=False,
+        log_level="warning",
+    )
+
+
 def create_base_arg_parser(description: str) -> argparse.ArgumentParser:
     """
     Create a standard argument parser for white agents.
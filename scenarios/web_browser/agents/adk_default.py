@@ -13,7 +13,6 @@ Environment Variables:
 
 import os
 
-import uvicorn
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -27,9 +26,31 @@ from google.adk.agents import Agent
 from google.genai import types
 
 from scenarios.web_browser.agents import (
+    DETERMINISTIC_CONFIG,
     RetryGemini,
     create_agent_card,
     create_base_arg_parser,
+    run_agent_server,
+)
+
+BROWSER_INSTRUCTION = """You are a helpful web automation agent.
+Your task is to help complete web navigation and interaction tasks.
+
+Analyze the information provided and choose the appropriate action to progress toward completing the task.
+
+IMPORTANT: If you encounter blockers that cannot be bypassed, call "browser_close":
+- CAPTCHA/reCAPTCHA challenges (cannot solve programmatically)
+- Login walls that keep reappearing after closing
+- Access denied (403) or authentication required
+- Stuck in a loop (3+ similar actions without progress)
+
+Do not navigate to other websites to work around login walls."""
+
+# Sent verbatim as the system instruction (no state templating), so every
+# request starts with the same prefix and Gemini can reuse it through
+# implicit context caching
+BROWSER_STATIC_INSTRUCTION = types.Content(
+    role="user", parts=[types.Part(text=BROWSER_INSTRUCTION)]
 )
 
 
@@ -55,24 +76,8 @@ def main():
         name="browser_agent",
         model=model,
         description="A web browser navigation agent that helps complete web tasks.",
-        instruction="""You are a helpful web automation agent.
-Your task is to help complete web navigation and interaction tasks.
-
-Analyze the information provided and choose the appropriate action to progress toward completing the task.
-
-IMPORTANT: If you encounter blockers that cannot be bypassed, call "browser_close":
-- CAPTCHA/reCAPTCHA challenges (cannot solve programmatically)
-- Login walls that keep reappearing after closing
-- Access denied (403) or authentication required
-- Stuck in a loop (3+ similar actions without progress)
-
-Do not navigate to other websites to work around login walls.""",
-        generate_content_config=types.GenerateContentConfig(
-            temperature=0.0,
-            top_p=0.0,
-            top_k=1,
-            seed=42,
-        ),
+        static_instruction=BROWSER_STATIC_INSTRUCTION,
+        generate_content_config=DETERMINISTIC_CONFIG,
     )
 
     # Create agent card
@@ -88,7 +93,7 @@ Do not navigate to other websites to work around login walls.""",
     a2a_app = to_a2a(root_agent, agent_card=agent_card)
 
     print(f"Starting white agent (adk_default) on {args.host}:{args.port}")
-    uvicorn.run(a2a_app, host=args.host, port=args.port)
+    run_agent_server(a2a_app, args.host, args.port)
 
 
 if __name__ == "__main__":
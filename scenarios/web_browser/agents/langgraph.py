@@ -14,15 +14,19 @@ Uses ADK BaseAgent pattern for compatibility with to_a2a() and Docker builds.
 Environment Variables:
     PURPLE_AGENT_MODEL: Model to use (default: gemini-2.5-flash)
                         Options: gemini-2.5-flash, gemini-2.5-pro
+    WABE_MAX_SNAPSHOT_CHARS: Longest page snapshot, in characters, kept in
+                        the prompt (default: 48000)
 """
 
-import json
+import asyncio
+import hashlib
 import logging
 import os
 from collections.abc import AsyncGenerator
+from functools import lru_cache
 from typing import Any
 
-import uvicorn
+import orjson
 from dotenv import load_dotenv
 from google.adk.a2a.utils.agent_to_a2a import to_a2a
 from google.adk.agents import BaseAgent
@@ -38,31 +42,50 @@ load_dotenv()
 DEFAULT_MODEL = "gemini-2.5-flash"
 AGENT_MODEL = os.getenv("PURPLE_AGENT_MODEL", DEFAULT_MODEL)
 
-from scenarios.web_browser.agents import create_agent_card, create_base_arg_parser
+from scenarios.web_browser.agents import (
+    create_agent_card,
+    create_base_arg_parser,
+    run_agent_server,
+)
 
 logger = logging.getLogger(__name__)
 
 
+# LLM calls currently awaiting Gemini, keyed by a 16-byte digest of
+# (model, prompt) rather than the ~40 KB prompt itself
+_inflight_calls: dict[bytes, asyncio.Future[dict[str, Any]]] = {}
+
+
+def _prompt_key(model: str, prompt: str) -> bytes:
+    """Digest identifying a (model, prompt) pair among in-flight calls."""
+    digest = hashlib.blake2b(model.encode(), digest_size=16)
+    digest.update(b"\0")
+    digest.update(prompt.encode())
+    return digest.digest()
+
+
+@lru_cache(maxsize=4)
+def _get_llm(model: str, temperature: float, top_p: float) -> ChatGoogleGenerativeAI:
+    """Return a shared chat model client for the given settings."""
+    return ChatGoogleGenerativeAI(
+        model=model,
+        temperature=temperature,
+        top_p=top_p,
+    )
+
+
 # ==============================================================================
 # ReAct Prompt Template
 # ==============================================================================
 
 
-def build_react_prompt(
-    task_description: str,
-    current_snapshot: str,
-) -> str:
-    """
-    Build a ReAct-style prompt for reasoning.
-
-    This prompt guides the LLM to think step-by-step and choose appropriate
-    actions based on the current state of the browser.
-    """
-    prompt = f"""You are a web automation agent using the ReAct pattern.
+# The prompt is assembled by concatenating these fixed pieces around the task
+# and snapshot, so the text surrounding them is byte-identical on every step
+_PROMPT_HEAD = """You are a web automation agent using the ReAct pattern.
 
-TASK: {task_description}
+TASK: """
 
-AVAILABLE TOOLS:
+_TOOL_CATALOG = """AVAILABLE TOOLS:
 
 browser_click:
   Click on an element
@@ -91,10 +114,11 @@ browser_scroll:
 
 browser_close:
   Close the browser and end the task
-  Parameters: none
+  Parameters: none"""
+
+_PROMPT_MID = "\n\n" + _TOOL_CATALOG + "\n\nCURRENT PAGE SNAPSHOT:\n"
 
-CURRENT PAGE SNAPSHOT:
-{current_snapshot}
+_PROMPT_TAIL = """
 
 Follow the ReAct pattern:
 1. THINK: Analyze the current state and reason about what to do next
@@ -103,14 +127,14 @@ Follow the ReAct pattern:
 You MUST respond with valid JSON in the following format wrapped in <json></json> tags:
 
 <json>
-{{
+{
   "thought": "Your step-by-step reasoning about what to do next",
   "tool": "tool_name",
-  "params": {{
+  "params": {
     "param1": "value1",
     "param2": "value2"
-  }}
-}}
+  }
+}
 </json>
 
 Important guidelines:
@@ -122,7 +146,40 @@ Important guidelines:
 
 Now, think step-by-step and decide what to do next:"""
 
-    return prompt
+
+def build_react_prompt(
+    task_description: str,
+    current_snapshot: str,
+) -> str:
+    """
+    Build a ReAct-style prompt for reasoning.
+
+    This prompt guides the LLM to think step-by-step and choose appropriate
+    actions based on the current state of the browser.
+    """
+    return (
+        _PROMPT_HEAD + task_description + _PROMPT_MID + current_snapshot + _PROMPT_TAIL
+    )
+
+
+# Markers in the green agent's message around the task and page snapshot
+_TASK_MARKER = "TASK:"
+_SNAPSHOT_MARKER = "CURRENT PAGE SNAPSHOT:"
+_TRUNCATED_MARKER = "[Snapshot truncated"
+
+# Upper bound on the snapshot text placed into the prompt; longer snapshots
+# keep their head and tail around an elision notice
+MAX_SNAPSHOT_CHARS = int(os.getenv("WABE_MAX_SNAPSHOT_CHARS", "48000"))
+_SNAPSHOT_ELISION = "\n…[snapshot truncated]…\n"
+
+
+def _truncate_snapshot(snapshot: str, limit: int = MAX_SNAPSHOT_CHARS) -> str:
+    """Cut the middle out of a snapshot longer than limit characters."""
+    if len(snapshot) <= limit:
+        return snapshot
+    head = limit // 2
+    tail = max(limit - head - len(_SNAPSHOT_ELISION), 0)
+    return snapshot[:head] + _SNAPSHOT_ELISION + snapshot[len(snapshot) - tail :]
 
 
 # ==============================================================================
@@ -143,35 +200,41 @@ class LangGraphReActAgent(BaseAgent):
 
     def _get_snapshot_text(self, ctx: InvocationContext) -> str:
         """Extract text content from the latest user message."""
-        if ctx.user_content is None:
+        user_content = ctx.user_content
+        if user_content is None or user_content.parts is None:
             return ""
 
-        parts = ctx.user_content.parts
-        if parts is None:
-            return ""
-
-        text_parts = []
-        for part in parts:
-            if hasattr(part, "text") and part.text:
-                text_parts.append(part.text)
-
-        return "".join(text_parts)
+        return "".join(part.text for part in user_content.parts if part.text)
 
     def _extract_task(self, text: str) -> str:
         """Extract task description from message text."""
-        if "TASK:" in text:
-            lines = text.split("TASK:")[1].split("\n")
-            return lines[0].strip() if lines else "Complete the web task"
-        return "Complete the web task"
+        start = text.find(_TASK_MARKER)
+        if start < 0:
+            return "Complete the web task"
+        start += len(_TASK_MARKER)
+
+        # Task runs to the end of its line (or a repeated marker)
+        end = len(text)
+        for terminator in (_TASK_MARKER, "\n"):
+            idx = text.find(terminator, start, end)
+            if idx >= 0:
+                end = idx
+        return text[start:end].strip()
 
     def _extract_snapshot(self, text: str) -> str:
         """Extract page snapshot from message text."""
-        if "CURRENT PAGE SNAPSHOT:" in text:
-            snapshot = text.split("CURRENT PAGE SNAPSHOT:")[1]
-            if "[Snapshot truncated" in snapshot:
-                snapshot = snapshot.split("[Snapshot truncated")[0]
-            return snapshot.strip()
-        return text  # Use full text as snapshot if no marker
+        start = text.find(_SNAPSHOT_MARKER)
+        if start < 0:
+            return _truncate_snapshot(text)  # Use full text if no marker
+        start += len(_SNAPSHOT_MARKER)
+
+        # Snapshot ends at the truncation notice or a repeated marker
+        end = len(text)
+        for terminator in (_SNAPSHOT_MARKER, _TRUNCATED_MARKER):
+            idx = text.find(terminator, start, end)
+            if idx >= 0:
+                end = idx
+        return _truncate_snapshot(text[start:end].strip())
 
     def _build_response(self, thought: str, tool: str, params: dict) -> str:
         """Build <json>{"thought", "tool", "params"}</json> response string."""
@@ -180,36 +243,52 @@ class LangGraphReActAgent(BaseAgent):
             "tool": tool,
             "params": params,
         }
-        return f"<json>{json.dumps(response_dict)}</json>"
+        return f"<json>{orjson.dumps(response_dict).decode()}</json>"
 
-    def _call_llm(self, prompt: str) -> dict[str, Any]:
+    async def _call_llm(self, prompt: str) -> dict[str, Any]:
         """
         Call LangChain LLM with ReAct prompt and parse response.
 
-        Returns dict with 'thought', 'tool', 'params' keys.
+        Returns dict with 'thought', 'tool', 'params' keys. Concurrent calls
+        with an identical prompt share a single Gemini request.
         """
-        llm = ChatGoogleGenerativeAI(
-            model=AGENT_MODEL,
-            temperature=0.0,
-            top_p=0.95,
-        )
-
-        response = llm.invoke([HumanMessage(content=prompt)])
+        prompt_key = _prompt_key(AGENT_MODEL, prompt)
+        pending = _inflight_calls.get(prompt_key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._generate(prompt))
+            _inflight_calls[prompt_key] = pending
+            pending.add_done_callback(lambda _: _inflight_calls.pop(prompt_key, None))
+        else:
+            logger.info("Joining in-flight LLM call for identical prompt")
+
+        # Shielded so one caller being cancelled doesn't cancel the others
+        return dict(await asyncio.shield(pending))
+
+    async def _generate(self, prompt: str) -> dict[str, Any]:
+        """Send the prompt to Gemini and parse the reply."""
+        llm = _get_llm(AGENT_MODEL, 0.0, 0.95)
+
+        response = await llm.ainvoke([HumanMessage(content=prompt)])
         response_text = response.content
 
         # Ensure response_text is a string
         if not isinstance(response_text, str):
             response_text = str(response_text)
 
-        logger.info(f"LLM Response:\n{response_text[:500]}...")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("LLM Response:\n%.500s...", response_text)
 
-        # Parse response
+        # Parse response: the payload between <json> and the next </json>
+        # (or the whole reply when it isn't wrapped)
         try:
-            if "<json>" in response_text and "</json>" in response_text:
-                json_str = response_text.split("<json>")[1].split("</json>")[0].strip()
-                parsed = json.loads(json_str)
+            start = response_text.find("<json>")
+            if start >= 0 and "</json>" in response_text:
+                start += len("<json>")
+                end = response_text.find("</json>", start)
+                json_str = response_text[start : end if end >= 0 else None]
+                parsed = orjson.loads(json_str.strip())
             else:
-                parsed = json.loads(response_text)
+                parsed = orjson.loads(response_text)
 
             return {
                 "thought": parsed.get("thought", "No thought provided"),
@@ -217,8 +296,8 @@ class LangGraphReActAgent(BaseAgent):
                 "params": parsed.get("params", {}),
             }
 
-        except (json.JSONDecodeError, KeyError, IndexError) as e:
-            logger.error(f"Failed to parse LLM response: {e}")
+        except (orjson.JSONDecodeError, KeyError, IndexError) as e:
+            logger.error("Failed to parse LLM response: %s", e)
             return {
                 "thought": f"Error parsing response: {e}",
                 "tool": "browser_close",
@@ -239,25 +318,25 @@ class LangGraphReActAgent(BaseAgent):
         """
         # Extract message text
         message_text = self._get_snapshot_text(ctx)
-        logger.info(f"LangGraph agent received message: {message_text[:200]}...")
+        logger.info("LangGraph agent received message: %.200s...", message_text)
 
         # Parse task and snapshot
         task = self._extract_task(message_text)
         snapshot = self._extract_snapshot(message_text)
 
-        logger.info(f"Task: {task}")
-        logger.info(f"Snapshot length: {len(snapshot)} chars")
+        logger.info("Task: %s", task)
+        logger.info("Snapshot length: %d chars", len(snapshot))
 
         # Build ReAct prompt and call LLM
         prompt = build_react_prompt(task, snapshot)
-        result = self._call_llm(prompt)
+        result = await self._call_llm(prompt)
 
         # Build response
         response = self._build_response(
             result["thought"], result["tool"], result["params"]
         )
 
-        logger.info(f"LangGraph agent response: {response[:200]}...")
+        logger.info("LangGraph agent response: %.200s...", response)
 
         yield Event(
             invocation_id=ctx.invocation_id,
@@ -291,7 +370,7 @@ def main() -> None:
     a2a_app = to_a2a(agent, agent_card=agent_card)
     print(f"Using model: {AGENT_MODEL}")
     print(f"Starting white agent (langgraph) on {args.host}:{args.port}")
-    uvicorn.run(a2a_app, host=args.host, port=args.port)
+    run_agent_server(a2a_app, args.host, args.port)
 
 
 if __name__ == "__main__":
@@ -15,7 +15,6 @@ import logging
 import os
 from typing import Optional
 
-import uvicorn
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -32,9 +31,11 @@ from google.adk.models.llm_response import LlmResponse
 from google.genai import types
 
 from scenarios.web_browser.agents import (
+    DETERMINISTIC_CONFIG,
     RetryGemini,
     create_agent_card,
     create_base_arg_parser,
+    run_agent_server,
 )
 
 logger = logging.getLogger(__name__)
@@ -113,6 +114,13 @@ Call "browser_close" when:
 - You have tried 3+ meaningfully different approaches and none succeeded
 """
 
+# Sent verbatim as the system instruction (no state templating), so every
+# step's request starts with the same prefix and Gemini can reuse it through
+# implicit context caching; only the per-step snapshot/screenshot varies
+REACT_STATIC_INSTRUCTION = types.Content(
+    role="user", parts=[types.Part(text=REACT_INSTRUCTION)]
+)
+
 
 def strip_images_from_history(
     callback_context: CallbackContext, llm_request: LlmRequest
@@ -138,46 +146,38 @@ def strip_images_from_history(
     """
     # Note: ADK calls this with keyword arguments, but we define positional params
     # to satisfy the type checker. Both work since Python allows either.
-    request = llm_request  # Alias for readability
-    if not request.contents:
-        return None
+    contents = llm_request.contents
+    if not contents or len(contents) <= 2:
+        return None  # No history old enough to strip
 
     # Find the last 2 user message indices (current + previous for comparison)
-    user_indices = []
-    for i, content in enumerate(request.contents):
-        if content.role == "user":
-            user_indices.append(i)
-    keep_indices = set(user_indices[-2:])  # Keep last 2 user messages with images
+    keep_indices = []
+    for i in range(len(contents) - 1, -1, -1):
+        if contents[i].role == "user":
+            keep_indices.append(i)
+            if len(keep_indices) == 2:
+                break
 
     # Strip images from all messages except the last 2 user messages
-    for i, content in enumerate(request.contents):
-        if i in keep_indices:
-            # Keep these user messages intact (current + previous screenshot)
+    for i, content in enumerate(contents):
+        if i in keep_indices or not content.parts:
             continue
 
-        if not content.parts:
-            continue
-
-        # Filter out image parts, replace with placeholder text
+        # Filter out image parts (inline_data with an image mime type)
         new_parts = []
         had_image = False
         for part in content.parts:
-            # Check if this is an image part (inline_data with image mime type)
-            if hasattr(part, "inline_data") and part.inline_data:
-                if (
-                    hasattr(part.inline_data, "mime_type")
-                    and part.inline_data.mime_type
-                ):
-                    if part.inline_data.mime_type.startswith("image/"):
-                        had_image = True
-                        continue  # Skip this image part
+            inline_data = part.inline_data
+            mime_type = inline_data.mime_type if inline_data else None
+            if mime_type and mime_type.startswith("image/"):
+                had_image = True
+                continue
             new_parts.append(part)
 
-        # Add a placeholder if we removed images
+        # Replace with placeholder text if we removed images
         if had_image:
             new_parts.append(types.Part(text="[screenshot was shown]"))
-
-        content.parts = new_parts
+            content.parts = new_parts
 
     return None  # Continue with modified request
 
@@ -207,14 +207,9 @@ def main():
         name="browser_agent_react",
         model=model,
         description="A ReAct web browser agent that uses Observe→Think→Act reasoning.",
-        instruction=REACT_INSTRUCTION,
+        static_instruction=REACT_STATIC_INSTRUCTION,
         before_model_callback=strip_images_from_history,  # Strips old screenshots to save tokens
-        generate_content_config=types.GenerateContentConfig(
-            temperature=0.0,
-            top_p=0.0,
-            top_k=1,
-            seed=42,
-        ),
+        generate_content_config=DETERMINISTIC_CONFIG,
     )
 
     # Create agent card
@@ -230,7 +225,7 @@ def main():
     a2a_app = to_a2a(root_agent, agent_card=agent_card)
 
     print(f"Starting white agent (react_adk) on {args.host}:{args.port}")
-    uvicorn.run(a2a_app, host=args.host, port=args.port)
+    run_agent_server(a2a_app, args.host, args.port)
 
 
 if __name__ == "__main__":
@@ -23,19 +23,48 @@ import json
 import logging
 import re
 from collections.abc import AsyncGenerator
+from functools import lru_cache
 
-import uvicorn
 from google.adk.a2a.utils.agent_to_a2a import to_a2a
 from google.adk.agents import BaseAgent
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.events import Event
 from google.genai import types
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 
-from scenarios.web_browser.agents import create_agent_card, create_base_arg_parser
+from scenarios.web_browser.agents import (
+    create_agent_card,
+    create_base_arg_parser,
+    run_agent_server,
+)
 
 logger = logging.getLogger(__name__)
 
+# Stand-in ref used to split a prebuilt response around its ref value
+_REF_PLACEHOLDER = "\x00ref\x00"
+
+# Most sessions whose step counter is kept; older ones fall back to counting
+# events in the session
+MAX_TRACKED_SESSIONS = 256
+
+
+@lru_cache(maxsize=32)
+def _compile_ref_pattern(element_pattern: str) -> re.Pattern[str]:
+    """
+    Compile element_pattern followed by a [ref=<value>] tag on the same line.
+
+    IGNORECASE handles both "Från" and "från", etc. MULTILINE (not DOTALL)
+    keeps ".*?" from matching across lines.
+    """
+    return re.compile(
+        rf"{element_pattern}.*?\[ref=([^\]]+)\]", re.IGNORECASE | re.MULTILINE
+    )
+
+
+def _model_content(text: str) -> types.Content:
+    """Wrap a response string as single-part model Content."""
+    return types.Content(role="model", parts=[types.Part(text=text)])
+
 
 class ReliabilityAgent(BaseAgent):
     """
@@ -52,6 +81,22 @@ class ReliabilityAgent(BaseAgent):
         "Deterministic replay agent for SL.se benchmark reliability testing"
     )
     actions: list[dict] = Field(default_factory=list)
+    # Last user_content seen by _get_snapshot_text and its joined text
+    _snapshot_source: types.Content | None = PrivateAttr(default=None)
+    _snapshot_text: str = PrivateAttr(default="")
+    # Refs already extracted from _ref_memo_source, by element pattern
+    _ref_memo_source: str | None = PrivateAttr(default=None)
+    _ref_memo: dict[str, str | None] = PrivateAttr(default_factory=dict)
+    # Next step index per unfinished session id, so steps aren't recounted
+    # from events (bounded by MAX_TRACKED_SESSIONS)
+    _step_counts: dict[str, int] = PrivateAttr(default_factory=dict)
+    # Per-step fields read on the hot path, indexed by step (see __init__)
+    _patterns: tuple[str | None, ...] = PrivateAttr(default=())
+    _response_templates: tuple[tuple[str, str], ...] = PrivateAttr(default=())
+    _not_found_responses: tuple[str, ...] = PrivateAttr(default=())
+    # Shared model Content for steps whose response never changes
+    _static_contents: tuple[types.Content | None, ...] = PrivateAttr(default=())
+    _overflow_content: types.Content | None = PrivateAttr(default=None)
 
     def __init__(self, **kwargs):
         """Initialize the agent and populate the 7-step action sequence."""
@@ -103,6 +148,46 @@ class ReliabilityAgent(BaseAgent):
             },
         ]
 
+        # Flatten the actions into per-step tuples so _run_async_impl indexes
+        # by step instead of looking up dict keys
+        self._patterns = tuple(action["element_pattern"] for action in self.actions)
+
+        # Compile every step's pattern up front rather than on the hot path
+        for pattern in self._patterns:
+            if pattern is not None:
+                _compile_ref_pattern(pattern)
+
+        # Prebuild each step's response. Steps that need a ref are split
+        # around it, so a step only JSON-encodes the ref it found; the rest
+        # are complete strings (with an empty suffix)
+        encoded_placeholder = json.dumps(_REF_PLACEHOLDER)
+        response_templates = []
+        not_found_responses = []
+        static_contents = []
+        for action, pattern in zip(self.actions, self._patterns):
+            params = action["params_template"]
+            not_found = ""
+            if pattern is not None:
+                params = {**params, "ref": _REF_PLACEHOLDER}
+                not_found = self._build_response(
+                    f"Element not found: {pattern}, requesting snapshot",
+                    "browser_snapshot",
+                    {},
+                )
+            response = self._build_response(action["thought"], action["tool"], params)
+            prefix, _, suffix = response.partition(encoded_placeholder)
+            response_templates.append((prefix, suffix))
+            not_found_responses.append(not_found)
+            static_contents.append(
+                _model_content(response) if pattern is None else None
+            )
+        self._response_templates = tuple(response_templates)
+        self._not_found_responses = tuple(not_found_responses)
+        self._static_contents = tuple(static_contents)
+        self._overflow_content = _model_content(
+            self._build_response("All steps completed", "browser_close", {})
+        )
+
     def _get_step_index(self, ctx: InvocationContext) -> int:
         """
         Determine current step by counting prior model events in session.
@@ -119,6 +204,46 @@ class ReliabilityAgent(BaseAgent):
                 count += 1
         return count
 
+    def _current_step_index(self, ctx: InvocationContext) -> int:
+        """
+        Return the session's current step index without advancing it.
+
+        Falls back to _get_step_index for sessions this instance isn't
+        tracking (e.g. after a restart or eviction), then counts in O(1) from
+        there via _advance_step.
+
+        Args:
+            ctx: Invocation context with the session
+
+        Returns:
+            Zero-based step index
+        """
+        step_index = self._step_counts.get(ctx.session.id)
+        if step_index is None:
+            step_index = self._get_step_index(ctx)
+        return step_index
+
+    def _advance_step(self, session_id: str, step_index: int) -> None:
+        """
+        Record that step_index was answered for session_id.
+
+        Sessions that reached the final step are forgotten, and the oldest
+        session is dropped once MAX_TRACKED_SESSIONS are tracked.
+
+        Args:
+            session_id: Session the step belongs to
+            step_index: Zero-based index of the step just answered
+        """
+        if step_index + 1 >= len(self._patterns):
+            self._step_counts.pop(session_id, None)
+            return
+        if (
+            session_id not in self._step_counts
+            and len(self._step_counts) >= MAX_TRACKED_SESSIONS
+        ):
+            del self._step_counts[next(iter(self._step_counts))]
+        self._step_counts[session_id] = step_index + 1
+
     def _extract_ref(self, snapshot_text: str, element_pattern: str) -> str | None:
         """
         Extract ref value from accessibility snapshot by matching element description.
@@ -136,11 +261,22 @@ class ReliabilityAgent(BaseAgent):
         if not snapshot_text:
             return None
 
+        # The same snapshot object (e.g. a re-sent message) is only scanned
+        # once per pattern
+        if snapshot_text is not self._ref_memo_source:
+            self._ref_memo_source = snapshot_text
+            self._ref_memo = {}
+        elif element_pattern in self._ref_memo:
+            return self._ref_memo[element_pattern]
+        ref = self._ref_memo[element_pattern] = self._search_ref(
+            snapshot_text, element_pattern
+        )
+        return ref
+
+    def _search_ref(self, snapshot_text: str, element_pattern: str) -> str | None:
+        """Scan snapshot_text for element_pattern's ref (see _extract_ref)."""
         # Search for the pattern followed by a ref tag on the same line
-        # Use IGNORECASE to handle both "Från" and "från", etc.
-        # Use MULTILINE to match ^ and $ per line, not DOTALL which would match across lines
-        pattern = rf"{element_pattern}.*?\[ref=([^\]]+)\]"
-        match = re.search(pattern, snapshot_text, re.IGNORECASE | re.MULTILINE)
+        match = _compile_ref_pattern(element_pattern).search(snapshot_text)
 
         if match:
             return match.group(1)
@@ -152,7 +288,8 @@ class ReliabilityAgent(BaseAgent):
         Extract text content from the latest user message.
 
         Iterates through ctx.user_content.parts, concatenates text parts,
-        ignores image/file parts.
+        ignores image/file parts. The result is kept for the most recent
+        user_content object, so repeated calls for one message join once.
 
         Args:
             ctx: Invocation context with user_content
@@ -160,19 +297,22 @@ class ReliabilityAgent(BaseAgent):
         Returns:
             Concatenated text from user message parts
         """
-        if ctx.user_content is None:
+        user_content = ctx.user_content
+        if user_content is None:
             return ""
+        if user_content is self._snapshot_source:
+            return self._snapshot_text
 
-        parts = ctx.user_content.parts
+        parts = user_content.parts
         if parts is None:
             return ""
 
-        text_parts = []
-        for part in parts:
-            if hasattr(part, "text") and part.text:
-                text_parts.append(part.text)
-
-        return "".join(text_parts)
+        self._snapshot_source = user_content
+        # filter(None, ...) drops parts whose text is missing, None or empty
+        self._snapshot_text = "".join(
+            filter(None, (getattr(part, "text", None) for part in parts))
+        )
+        return self._snapshot_text
 
     def _build_response(self, thought: str, tool: str, params: dict) -> str:
         """
@@ -199,7 +339,9 @@ class ReliabilityAgent(BaseAgent):
         """
         Core agent logic: determine current step, extract ref from snapshot, yield Event.
 
-        Counts prior model events in ctx.session.events to determine current step index.
+        Tracks the current step index per session (counting prior model events
+        in ctx.session.events the first time a session is seen) and advances
+        it once the step's response is built.
         Extracts snapshot text from ctx.user_content (latest user message).
         Pattern-matches element description to find ref value.
         Yields a single Event with <json> response.
@@ -210,53 +352,50 @@ class ReliabilityAgent(BaseAgent):
         Yields:
             Event with content containing <json>{"thought", "tool", "params"}</json>
         """
-        step_index = self._get_step_index(ctx)
-        logger.info(f"Reliability agent step {step_index + 1}/{len(self.actions)}")
+        step_index = self._current_step_index(ctx)
+        logger.info("Reliability agent step %d/%d", step_index + 1, len(self._patterns))
 
         # Safety: if past all steps, close browser
-        if step_index >= len(self.actions):
+        if step_index >= len(self._patterns):
             logger.info("All steps completed, sending browser_close")
-            response = self._build_response("All steps completed", "browser_close", {})
+            self._advance_step(ctx.session.id, step_index)
             yield Event(
                 invocation_id=ctx.invocation_id,
                 author=self.name,
                 branch=ctx.branch,
-                content=types.Content(role="model", parts=[types.Part(text=response)]),
+                content=self._overflow_content,
             )
             return
 
-        action = self.actions[step_index]
+        pattern = self._patterns[step_index]
+        prefix, suffix = self._response_templates[step_index]
 
         # Last step (browser_close) needs no ref extraction
-        if action["element_pattern"] is None:
-            response = self._build_response(
-                action["thought"], action["tool"], action["params_template"]
-            )
-        else:
+        content = self._static_contents[step_index]
+        if content is None:
             snapshot_text = self._get_snapshot_text(ctx)
-            ref = self._extract_ref(snapshot_text, action["element_pattern"])
+            ref = self._extract_ref(snapshot_text, pattern)
 
             if ref is None:
                 logger.warning(
-                    f"Element not found for step {step_index}: {action['element_pattern']}"
+                    "Element not found for step %d: %s",
+                    step_index,
+                    pattern,
                 )
                 # Request fresh snapshot as fallback
-                response = self._build_response(
-                    f"Element not found: {action['element_pattern']}, requesting snapshot",
-                    "browser_snapshot",
-                    {},
-                )
+                response = self._not_found_responses[step_index]
             else:
-                params = {**action["params_template"], "ref": ref}
-                response = self._build_response(
-                    action["thought"], action["tool"], params
-                )
+                response = prefix + json.dumps(ref) + suffix
+            content = _model_content(response)
 
+        # Only count the step once its response exists, so a step that
+        # failed is answered again on retry
+        self._advance_step(ctx.session.id, step_index)
         yield Event(
             invocation_id=ctx.invocation_id,
             author=self.name,
             branch=ctx.branch,
-            content=types.Content(role="model", parts=[types.Part(text=response)]),
+            content=content,
         )
 
 
@@ -264,7 +403,8 @@ def main() -> None:
     """
     CLI entry point: create ReliabilityAgent, wrap with to_a2a(), serve via uvicorn.
 
-    Uses create_base_arg_parser() and create_agent_card() from agents __init__.
+    Uses create_base_arg_parser(), create_agent_card() and run_agent_server()
+    from agents __init__.
     """
     parser = create_base_arg_parser("Run the deterministic reliability replay agent.")
     args = parser.parse_args()
@@ -280,7 +420,7 @@ def main() -> None:
 
     a2a_app = to_a2a(agent, agent_card=agent_card)
     print(f"Starting reliability agent on {args.host}:{args.port}")
-    uvicorn.run(a2a_app, host=args.host, port=args.port)
+    run_agent_server(a2a_app, args.host, args.port)
 
 
 if __name__ == "__main__":
@@ -8,19 +8,24 @@ by orchestrating browser interactions and coordinating with the white agent.
 import argparse
 import asyncio
 import contextlib
-import json
+import itertools
 import logging
 import os
 import shutil
 import sys
+import time
+from collections import ChainMap
+from collections.abc import Mapping
 from dataclasses import dataclass
-from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+import httpx
+import orjson
 import uvicorn
 
 # A2A framework
+from a2a.client.errors import A2AClientTimeoutError
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.server.tasks import InMemoryTaskStore, TaskUpdater
@@ -35,9 +40,11 @@ from a2a.types import (
     TextPart,
 )
 from a2a.utils import new_agent_text_message
+from aiolimiter import AsyncLimiter
 from dotenv import load_dotenv
 
 # AgentBeats framework
+from agentbeats.client import DEFAULT_TIMEOUT, is_rate_limit_error
 from agentbeats.green_executor import GreenAgent, GreenExecutor
 from agentbeats.models import EvalRequest, EvalResult
 from agentbeats.tool_provider import ToolProvider
@@ -54,28 +61,46 @@ from green_agent.constants import (
     MAX_HTML_CONTEXT_LENGTH,
     MAX_PARALLEL_TASKS,
     TASK_RESULT_OUTPUT_DIR,
+    WHITE_AGENT_RPM,
+    WHITE_AGENT_THROTTLE_PERIOD,
 )
 
 # Default score threshold for evaluation (matches benchmark.py default)
 EVAL_SCORE_THRESHOLD = 3
 
+# Errors that mean a white agent call timed out (message text is the fallback)
+WHITE_AGENT_TIMEOUT_ERRORS = (
+    TimeoutError,
+    httpx.TimeoutException,
+    A2AClientTimeoutError,
+)
+
 # Maximum consecutive parse errors before giving up on a task
 # Prevents wasting all steps on a model that won't follow format instructions
 MAX_CONSECUTIVE_PARSE_ERRORS = 3
+
+# Fixed pieces of the per-step message sent to the white agent
+SNAPSHOT_HEADER = "\n\nCURRENT PAGE SNAPSHOT:\n"
+STEP_PROMPT_TAIL = "\n\nWhat should we do next?"
+PARSE_ERROR_FOOTER = (
+    "\n\nPlease try again with the correct format. "
+    "Remember to wrap your JSON in <json></json> tags.\n\n"
+)
 from green_agent.prompts import (
     BrowserJudgePrompts,
     build_tools_prompt,
 )
 from shared.browser_agent import BrowserAgent
+from shared.mcp_client import MCPBrowserClient
 from shared.response_parser import parse_white_agent_response
+from utils import event_loop
+from utils.logging_setup import init_logging
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+# Configure logging (records are written from a background thread)
+init_logging(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -97,6 +122,14 @@ class TaskResult:
     error_message: str | None
 
 
+def _task_timestamp() -> str:
+    """Return a "%Y%m%d_%H%M%S_<microseconds>" local timestamp from one clock read."""
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    return (
+        f"{time.strftime('%Y%m%d_%H%M%S', time.localtime(seconds))}_{nanos // 1000:06d}"
+    )
+
+
 class BrowserJudge(GreenAgent):
     """
     Green agent that evaluates white agents on web browsing tasks.
@@ -114,10 +147,19 @@ class BrowserJudge(GreenAgent):
             limit: Maximum number of tasks to run (None = all tasks)
             level: Filter tasks by difficulty level ("easy", "medium", "hard", or None for all)
         """
-        self._required_roles = ["white_agent"]
-        self._required_task_keys = ["task_id", "website", "task"]
+        self._required_roles = frozenset({"white_agent"})
+        self._required_task_keys = frozenset({"task_id", "website", "task"})
         self._limit = limit
         self._level = level
+        # Paces white agent steps across all parallel tasks (off when
+        # WHITE_AGENT_RPM is 0); after a rate limit error every step costs
+        # double until _throttled_until, so capacity must be at least 2
+        self._step_limiter = (
+            AsyncLimiter(max(2, WHITE_AGENT_RPM), WHITE_AGENT_THROTTLE_PERIOD)
+            if WHITE_AGENT_RPM
+            else None
+        )
+        self._throttled_until = 0.0
         logger.info(f"BrowserJudge initialized (limit={limit}, level={level})")
 
     def validate_request(self, request: EvalRequest) -> tuple[bool, str]:
@@ -131,29 +173,60 @@ class BrowserJudge(GreenAgent):
             Tuple of (is_valid, message)
         """
         # Check for required participant roles
-        missing_roles = set(self._required_roles) - set(request.participants.keys())
+        missing_roles = self._required_roles.difference(request.participants)
         if missing_roles:
-            return False, f"Missing required participant roles: {missing_roles}"
+            return False, f"Missing required participant roles: {set(missing_roles)}"
+
+        # Check max_concurrency here so a bad value fails the request up
+        # front rather than in run_eval after tasks were accepted
+        if "max_concurrency" in request.config:
+            value = request.config["max_concurrency"]
+            if self._parse_max_concurrency(value) is None:
+                return (
+                    False,
+                    f"config.max_concurrency must be a positive integer, got {value!r}",
+                )
 
-        # Get tasks list - check request.tasks, then config.tasks, then fallback to config as single task
-        if request.tasks:
-            tasks = request.tasks
-        elif "tasks" in request.config:
-            tasks = request.config["tasks"]
-        else:
-            tasks = [request.config]
+        tasks = self._extract_tasks(request)
 
-        # Validate each task has required keys
+        # Validate each task has required keys; a key counts if either the
+        # base config or the task itself has it, so nothing needs merging
         for i, task in enumerate(tasks):
-            # Merge base config with task-specific config
-            merged_task = {**request.config, **task}
-            missing_keys = set(self._required_task_keys) - set(merged_task.keys())
+            missing_keys = self._required_task_keys.difference(
+                request.config
+            ).difference(task)
             if missing_keys:
-                return False, f"Task {i} missing required keys: {missing_keys}"
+                return False, f"Task {i} missing required keys: {set(missing_keys)}"
 
         logger.info(f"Request validation passed: {len(tasks)} task(s)")
         return True, "ok"
 
+    @staticmethod
+    def _parse_max_concurrency(value: Any) -> int | None:
+        """Return value (an int or an integer string) as a positive int, else None."""
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, str):
+            try:
+                value = int(value)
+            except ValueError:
+                return None
+        if isinstance(value, int) and value >= 1:
+            return value
+        return None
+
+    @staticmethod
+    def _extract_tasks(req: EvalRequest) -> list[dict[str, Any]]:
+        """
+        Get the request's task configs: req.tasks, then config["tasks"], then
+        the config itself as a single task.
+        """
+        if req.tasks:
+            return req.tasks
+        if "tasks" in req.config:
+            return req.config["tasks"]
+        return [req.config]
+
     async def run_eval(self, req: EvalRequest, updater: TaskUpdater) -> None:
         """
         Run the browser task evaluation for multiple tasks in parallel.
@@ -162,34 +235,22 @@ class BrowserJudge(GreenAgent):
             req: The evaluation request containing participants and config
             updater: TaskUpdater for sending status updates and artifacts
         """
-        logger.info(f"Starting browser evaluation: {req}")
-
-        # Get tasks list - check request.tasks, then config.tasks, then fallback to config as single task
-        if req.tasks:
-            tasks_config = req.tasks
-        elif "tasks" in req.config:
-            tasks_config = req.config["tasks"]
-        else:
-            tasks_config = [req.config]
+        logger.info("Starting browser evaluation: %s", req)
 
-        # Merge base config with each task config
-        merged_tasks = [{**req.config, **task} for task in tasks_config]
-
-        # Apply filtering based on level and limit
+        # Layer each task config over the base config without copying it, and
+        # apply the level filter and limit in the same pass (stopping early)
+        tasks_config = self._extract_tasks(req)
+        selected = (ChainMap(task, req.config) for task in tasks_config)
         if self._level:
-            original_count = len(merged_tasks)
-            merged_tasks = [
-                task for task in merged_tasks if task.get("level") == self._level
-            ]
-            logger.info(
-                f"Filtered tasks by level '{self._level}': {original_count} -> {len(merged_tasks)} task(s)"
-            )
-
+            selected = (task for task in selected if task.get("level") == self._level)
         if self._limit and self._limit > 0:
-            original_count = len(merged_tasks)
-            merged_tasks = merged_tasks[: self._limit]
+            selected = itertools.islice(selected, self._limit)
+        merged_tasks = list(selected)
+
+        if len(merged_tasks) != len(tasks_config):
             logger.info(
-                f"Limited tasks to {self._limit}: {original_count} -> {len(merged_tasks)} task(s)"
+                f"Selected tasks (level={self._level!r}, limit={self._limit}): "
+                f"{len(tasks_config)} -> {len(merged_tasks)} task(s)"
             )
 
         await updater.update_status(
@@ -199,52 +260,95 @@ class BrowserJudge(GreenAgent):
             ),
         )
 
-        # Run all tasks in parallel with concurrency limit
+        # Run all tasks in parallel with concurrency limit; the request's
+        # config can override the MAX_PARALLEL_TASKS default (validate_request
+        # has already rejected values that aren't positive integers)
+        if "max_concurrency" in req.config:
+            max_concurrency = self._parse_max_concurrency(req.config["max_concurrency"])
+        else:
+            max_concurrency = max(1, MAX_PARALLEL_TASKS)
         logger.info(
-            f"Running {len(merged_tasks)} tasks in parallel (max {MAX_PARALLEL_TASKS} concurrent)"
+            f"Running {len(merged_tasks)} tasks in parallel (max {max_concurrency} concurrent)"
         )
-        semaphore = asyncio.Semaphore(MAX_PARALLEL_TASKS)
-
-        async def run_with_semaphore(task_config: dict, task_idx: int):
-            async with semaphore:
-                return await self._run_single_task(task_config, req, updater, task_idx)
-
-        results = await asyncio.gather(
-            *[
-                run_with_semaphore(task_config, task_idx)
-                for task_idx, task_config in enumerate(merged_tasks)
-            ],
-            return_exceptions=True,
+        # One connection pool for every task's white agent traffic
+        httpx_client = httpx.AsyncClient(
+            timeout=DEFAULT_TIMEOUT,
+            limits=httpx.Limits(
+                max_keepalive_connections=max_concurrency * 2,
+                max_connections=max_concurrency * 4,
+            ),
         )
 
-        # Process results
-        task_results: list[TaskResult] = []
-        for i, result in enumerate(results):
-            if isinstance(result, BaseException):
-                logger.error(f"Task {i} failed with exception: {result}")
-                # Create error result
-                task_config = merged_tasks[i]
-                task_results.append(
-                    TaskResult(
-                        task_id=task_config.get("task_id", f"task_{i}"),
-                        task_id_with_timestamp=f"{task_config.get('task_id', f'task_{i}')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-                        website=task_config.get("website", ""),
-                        task_description=task_config.get("task", ""),
-                        level=task_config.get("level", "unknown"),
-                        success=False,
-                        step_count=0,
-                        max_steps=int(task_config.get("max_steps", 10)),
-                        thoughts=[],
-                        action_history=[],
-                        screenshots=[],
-                        error_message=str(result),
+        # max_concurrency workers pull tasks off a queue and report each
+        # result as it finishes; slots keep task_results in task order
+        task_queue: asyncio.Queue[tuple[int, Mapping[str, Any]]] = asyncio.Queue()
+        for item in enumerate(merged_tasks):
+            task_queue.put_nowait(item)
+        slots: list[TaskResult | None] = [None] * len(merged_tasks)
+        done_count = 0
+
+        async def worker() -> None:
+            nonlocal done_count
+            # One MCP server per worker, reset between its tasks instead of
+            # being respawned for each one
+            mcp_client = MCPBrowserClient()
+            try:
+                while not task_queue.empty():
+                    i, task_config = task_queue.get_nowait()
+                    try:
+                        result = await self._run_single_task(
+                            task_config, req, updater, i, httpx_client, mcp_client
+                        )
+                        outcome = "succeeded" if result.success else "finished"
+                    except Exception as e:
+                        logger.error(f"Task {i} failed with exception: {e}")
+                        # Create error result
+                        result = TaskResult(
+                            task_id=task_config.get("task_id", f"task_{i}"),
+                            task_id_with_timestamp=f"{task_config.get('task_id', f'task_{i}')}_{_task_timestamp()}",
+                            website=task_config.get("website", ""),
+                            task_description=task_config.get("task", ""),
+                            level=task_config.get("level", "unknown"),
+                            success=False,
+                            step_count=0,
+                            max_steps=int(task_config.get("max_steps", 10)),
+                            thoughts=[],
+                            action_history=[],
+                            screenshots=[],
+                            error_message=str(e),
+                        )
+                        outcome = f"failed: {result.error_message}"
+                    slots[i] = result
+                    done_count += 1
+
+                    await updater.update_status(
+                        TaskState.working,
+                        new_agent_text_message(
+                            f"[{done_count}/{len(merged_tasks)}] Task {i} ({result.task_id}) {outcome}"
+                        ),
                     )
-                )
-            elif isinstance(result, TaskResult):
-                task_results.append(result)
+            finally:
+                if mcp_client.server_process is not None:
+                    await mcp_client.stop()
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(max_concurrency, len(merged_tasks)))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            # No-op after a normal run; on early exit let cancelled workers
+            # release their browsers before the shared client closes
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await httpx_client.aclose()
+
+        task_results: list[TaskResult] = [r for r in slots if r is not None]
 
         # Run benchmark evaluation once after all tasks complete
-        success_rate = self._run_final_evaluation()
+        success_rate = await self._run_final_evaluation()
 
         # Parse LLM evaluation results to get per-task success
         llm_predicted_labels = self._parse_eval_results()
@@ -299,7 +403,15 @@ class BrowserJudge(GreenAgent):
 
         await updater.add_artifact(
             parts=[
-                Part(root=TextPart(text=aggregated_result.model_dump_json(indent=2)))
+                Part(
+                    root=TextPart(
+                        # detail is already plain JSON data, so a shallow
+                        # dict() spares model_dump's recursive copy of it
+                        text=orjson.dumps(
+                            dict(aggregated_result), option=orjson.OPT_INDENT_2
+                        ).decode()
+                    )
+                )
             ],
             name="EvaluationResult",
         )
@@ -310,19 +422,10 @@ class BrowserJudge(GreenAgent):
             ),
         )
 
-    def _run_final_evaluation(self) -> float:
+    async def _run_final_evaluation(self) -> float:
         """Run benchmark evaluation once after all tasks complete."""
         # Clean up incomplete result directories before evaluation
-        results_dir = Path(TASK_RESULT_OUTPUT_DIR)
-        if results_dir.exists():
-            for task_dir in results_dir.iterdir():
-                if task_dir.is_dir():
-                    result_file = task_dir / "result.json"
-                    if not result_file.exists():
-                        logger.warning(
-                            f"Removing incomplete result directory: {task_dir.name}"
-                        )
-                        shutil.rmtree(task_dir)
+        await self._remove_incomplete_results()
 
         success_rate = run_benchmark_eval(
             Config(
@@ -335,6 +438,26 @@ class BrowserJudge(GreenAgent):
         )
         return success_rate
 
+    async def _remove_incomplete_results(self) -> None:
+        """Delete task result directories that have no result.json."""
+        try:
+            with os.scandir(TASK_RESULT_OUTPUT_DIR) as entries:
+                incomplete = [
+                    entry
+                    for entry in entries
+                    if entry.is_dir()
+                    and not os.path.exists(os.path.join(entry.path, "result.json"))
+                ]
+        except FileNotFoundError:
+            return
+
+        for entry in incomplete:
+            logger.warning(f"Removing incomplete result directory: {entry.name}")
+        # rmtree is blocking; remove the directories in parallel off the loop
+        await asyncio.gather(
+            *(asyncio.to_thread(shutil.rmtree, entry.path) for entry in incomplete)
+        )
+
     def _parse_eval_results(self) -> dict[str, int]:
         """
         Parse LLM evaluation results from the JSONL file.
@@ -353,19 +476,18 @@ class BrowserJudge(GreenAgent):
             return predicted_labels
 
         try:
-            with open(eval_file, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        result = json.loads(line)
-                        task_id = result.get("task_id", "")
-                        label = result.get("predicted_label", 0)
-                        predicted_labels[task_id] = label
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"Failed to parse eval result line: {e}")
-                        continue
+            for line in eval_file.read_bytes().splitlines():
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    result = orjson.loads(line)
+                    task_id = result.get("task_id", "")
+                    label = result.get("predicted_label", 0)
+                    predicted_labels[task_id] = label
+                except orjson.JSONDecodeError as e:
+                    logger.warning(f"Failed to parse eval result line: {e}")
+                    continue
         except Exception as e:
             logger.error(f"Failed to read evaluation results: {e}")
 
@@ -374,10 +496,12 @@ class BrowserJudge(GreenAgent):
 
     async def _run_single_task(
         self,
-        task_config: dict[str, Any],
+        task_config: Mapping[str, Any],
         req: EvalRequest,
         updater: TaskUpdater,
         task_idx: int,
+        httpx_client: httpx.AsyncClient | None = None,
+        mcp_client: MCPBrowserClient | None = None,
     ) -> TaskResult:
         """
         Run a single task with isolated browser and tool provider.
@@ -387,6 +511,9 @@ class BrowserJudge(GreenAgent):
             req: The original evaluation request (for participants)
             updater: TaskUpdater for status updates
             task_idx: Index of this task (for logging)
+            httpx_client: Optional client shared across tasks for A2A calls
+            mcp_client: Optional MCP client reused across tasks; its browser is
+                reset rather than shut down when the task ends
 
         Returns:
             TaskResult with the outcome of this task
@@ -400,8 +527,7 @@ class BrowserJudge(GreenAgent):
         level = task_config.get("level", "unknown")
 
         # Generate timestamp for unique directory
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        task_id_with_timestamp = f"{task_id}_{timestamp}"
+        task_id_with_timestamp = f"{task_id}_{_task_timestamp()}"
 
         logger.info(f"[Task {task_idx}] Starting task: {task_id}")
 
@@ -410,10 +536,12 @@ class BrowserJudge(GreenAgent):
             new_agent_text_message(f"[Task {task_idx}] Starting: {task_id}"),
         )
 
-        # Create isolated resources for this task
-        tool_provider = ToolProvider()
+        # Create isolated resources for this task; the tool provider keeps its
+        # own conversation context but sends over the shared connection pool
+        tool_provider = ToolProvider(httpx_client=httpx_client)
         browser_agent = BrowserAgent(
             output_dir=f"{TASK_RESULT_OUTPUT_DIR}/{task_id_with_timestamp}",
+            mcp_client=mcp_client,
         )
 
         step_count = 0
@@ -425,17 +553,21 @@ class BrowserJudge(GreenAgent):
             logger.info(f"[Task {task_idx}] Starting browser at {website}")
             await browser_agent.start(website)
 
-            success, step_count, thoughts, error_message = await self._run_task_loop(
-                max_steps=max_steps,
-                step_delay=step_delay,
-                browser_agent=browser_agent,
-                tool_provider=tool_provider,
-                updater=updater,
-                task_description=task_description,
-                website=website,
-                white_agent_url=str(req.participants["white_agent"]),
-                task_idx=task_idx,
+            success, step_count, step_thoughts, error_message = (
+                await self._run_task_loop(
+                    max_steps=max_steps,
+                    step_delay=step_delay,
+                    browser_agent=browser_agent,
+                    tool_provider=tool_provider,
+                    updater=updater,
+                    task_description=task_description,
+                    website=website,
+                    white_agent_url=str(req.participants["white_agent"]),
+                    task_idx=task_idx,
+                )
             )
+            # Format the (step, thought) pairs once, now that the task is over
+            thoughts = [f"Step {step}: {thought}" for step, thought in step_thoughts]
 
             # Save browser session
             final_status = "completed" if success else "failed"
@@ -493,10 +625,15 @@ class BrowserJudge(GreenAgent):
         white_agent_url: str,
         task_idx: int,
     ):
-        """Run the main task execution loop."""
+        """
+        Run the main task execution loop.
+
+        Returns:
+            Tuple of (success, step_count, [(step, thought), ...], error_message)
+        """
         step_count: int = 0
         success = False
-        thoughts: list[str] = []
+        step_thoughts: list[tuple[int, str]] = []
         error_message: str | None = None
         browser_closed = False
 
@@ -532,31 +669,45 @@ class BrowserJudge(GreenAgent):
                         logger.info(f"      {param_desc}")
         logger.info("=" * 60)
 
+        # Tools don't change within a task: format them once for both the
+        # initial prompt and the follow-up step prompt around the snapshot
+        tools_section = build_tools_prompt(tools)
+
         # Prepare initial prompt for white agent
         initial_prompt = BrowserJudgePrompts.task_run_prompt(
-            task_description, website, tools
+            task_description,
+            website,
+            tools,
+            tools_section=tools_section if tools else None,
         )
+        step_prompt_head = f"{tools_section}{SNAPSHOT_HEADER}"
 
         error_feedback = None
         consecutive_parse_errors = 0
 
-        # Exponential backoff for step delay
-        # Start with configured delay, increase on rate limit errors, decrease on success
-        current_delay = step_delay
-        min_delay = step_delay  # Don't go below configured minimum
-        max_delay = step_delay * 8  # Cap at 8x the base delay
-        consecutive_successes = 0
+        # Pause before each step. Without the shared step limiter it never
+        # drops below step_delay, so steps stay paced out of the box; with
+        # it, the limiter paces steps and the pause only follows 429s. Each
+        # 429 doubles it up to 8x step_delay and each success halves it
+        min_backoff = step_delay if self._step_limiter is None else 0.0
+        backoff = min_backoff
+        max_backoff = step_delay * 8
+
+        # Snapshot of the page as of the last action; None once it is stale
+        snapshot: str | None = None
+        snapshot_truncated = ""
 
         for step in range(max_steps):
             step_count = step + 1
-            logger.info(f"[Task {task_idx}] Starting step {step_count}/{max_steps}")
+            logger.info(
+                "[Task %s] Starting step %s/%s", task_idx, step_count, max_steps
+            )
 
-            # Add delay between steps to avoid rate limiting (except first step)
-            if step > 0 and current_delay > 0:
+            if step > 0 and backoff > 0:
                 logger.info(
-                    f"[Task {task_idx}] Waiting {current_delay:.1f}s before next step..."
+                    "[Task %s] Waiting %.1fs before next step...", task_idx, backoff
                 )
-                await asyncio.sleep(current_delay)
+                await asyncio.sleep(backoff)
 
             await updater.update_status(
                 TaskState.working,
@@ -565,49 +716,54 @@ class BrowserJudge(GreenAgent):
                 ),
             )
 
-            # Get current page accessibility snapshot via MCP
-            snapshot = await browser_agent.get_snapshot()
+            # Get current page accessibility snapshot via MCP, unless no action
+            # has run since the last one (rate limit retry, parse error)
+            if snapshot is None:
+                snapshot = await browser_agent.get_snapshot()
 
-            # Truncate snapshot if too long
-            snapshot_truncated = snapshot[:MAX_HTML_CONTEXT_LENGTH]
-            if len(snapshot) > MAX_HTML_CONTEXT_LENGTH:
-                snapshot_truncated += "\n\n[Snapshot truncated for length...]"
+                # Truncate snapshot if too long
+                if len(snapshot) > MAX_HTML_CONTEXT_LENGTH:
+                    snapshot_truncated = (
+                        snapshot[:MAX_HTML_CONTEXT_LENGTH]
+                        + "\n\n[Snapshot truncated for length...]"
+                    )
+                else:
+                    snapshot_truncated = snapshot
+            else:
+                logger.info("[Task %s] Page unchanged, reusing snapshot", task_idx)
 
             # Prepare multi-part message
             parts = []
 
+            # Join the pieces in one pass so the (up to 40K char) snapshot is
+            # copied once per step, not once per concatenation
             if step == 0:
-                text_content = (
-                    initial_prompt + f"\n\nCURRENT PAGE SNAPSHOT:\n{snapshot_truncated}"
+                text_content = "".join(
+                    (initial_prompt, SNAPSHOT_HEADER, snapshot_truncated)
+                )
+            elif error_feedback:
+                text_content = "".join(
+                    (
+                        "ERROR IN PREVIOUS RESPONSE:\n",
+                        error_feedback,
+                        PARSE_ERROR_FOOTER,
+                        step_prompt_head,
+                        snapshot_truncated,
+                        STEP_PROMPT_TAIL,
+                    )
                 )
+                error_feedback = None
             else:
-                tools_section = build_tools_prompt(tools)
-
-                if error_feedback:
-                    text_content = f"""ERROR IN PREVIOUS RESPONSE:
-{error_feedback}
-
-Please try again with the correct format. Remember to wrap your JSON in <json></json> tags.
-
-{tools_section}
-
-CURRENT PAGE SNAPSHOT:
-{snapshot_truncated}
-
-What should we do next?"""
-                    error_feedback = None
-                else:
-                    text_content = f"""{tools_section}
-
-CURRENT PAGE SNAPSHOT:
-{snapshot_truncated}
-
-What should we do next?"""
+                text_content = "".join(
+                    (step_prompt_head, snapshot_truncated, STEP_PROMPT_TAIL)
+                )
 
             parts.append(Part(root=TextPart(text=text_content)))
 
             logger.info(
-                f"[Task {task_idx}] Text content being sent (first 300 chars):\n{text_content[:300]}"
+                "[Task %s] Text content being sent (first 300 chars):\n%.300s",
+                task_idx,
+                text_content,
             )
 
             # Add screenshot
@@ -623,11 +779,14 @@ What should we do next?"""
                 )
                 parts.append(Part(root=file_part))
             else:
-                logger.warning(f"[Task {task_idx}] No screenshot available")
+                logger.warning("[Task %s] No screenshot available", task_idx)
 
             logger.info("=" * 60)
             logger.info(
-                f"[Task {task_idx}] STEP {step_count}/{max_steps}: Sending to white agent"
+                "[Task %s] STEP %s/%s: Sending to white agent",
+                task_idx,
+                step_count,
+                max_steps,
             )
             logger.info("=" * 60)
 
@@ -636,13 +795,17 @@ What should we do next?"""
                 debug_snapshot_path = (
                     f"{browser_agent.output_dir}/step_{step_count:03d}_snapshot.txt"
                 )
-                Path(debug_snapshot_path).write_text(snapshot)
+                await asyncio.to_thread(Path(debug_snapshot_path).write_text, snapshot)
 
             # Send to white agent
             # Continue same conversation - white agent controls its own history strategy
             # (e.g., include_contents='none' for stateless, or 'default' for full history)
             # Add timeout to prevent jobs from hanging indefinitely in CI
             WHITE_AGENT_TIMEOUT = 300  # 5 minutes max per step
+            loop = asyncio.get_running_loop()
+            throttled = loop.time() < self._throttled_until
+            if self._step_limiter is not None:
+                await self._step_limiter.acquire(2 if throttled else 1)
             try:
                 response_text = await asyncio.wait_for(
                     tool_provider.talk_to_agent(
@@ -655,56 +818,58 @@ What should we do next?"""
 
                 logger.info("=" * 60)
                 logger.info(
-                    f"[Task {task_idx}] STEP {step_count}: Response from white agent"
+                    "[Task %s] STEP %s: Response from white agent", task_idx, step_count
                 )
                 logger.info("=" * 60)
-                logger.info(f"Full response:\n{response_text}")
+                # Responses can be tens of KB; only format them when debugging
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Full response:\n%s", response_text)
                 logger.info("=" * 60)
 
-                # Success - gradually decrease delay (but not below minimum)
-                consecutive_successes += 1
-                if consecutive_successes >= 3 and current_delay > min_delay:
-                    current_delay = max(min_delay, current_delay * 0.8)
-                    logger.info(
-                        f"[Task {task_idx}] Decreased step delay to {current_delay:.1f}s after {consecutive_successes} successes"
-                    )
+                # Success - ease off the backoff, back to its floor once below base
+                backoff = (
+                    max(min_backoff, backoff / 2)
+                    if backoff > step_delay
+                    else min_backoff
+                )
 
             except asyncio.TimeoutError:
                 error_message = (
                     f"White agent response timed out after {WHITE_AGENT_TIMEOUT}s"
                 )
-                logger.error(f"[Task {task_idx}] {error_message}")
+                logger.error("[Task %s] %s", task_idx, error_message)
                 # Don't retry on timeout - likely indicates a hung LLM call
                 break
 
             except Exception as e:
-                error_str = str(e).lower()
-                is_rate_limit = (
-                    "429" in error_str
-                    or "resource_exhausted" in error_str
-                    or "too many requests" in error_str
+                is_rate_limit = is_rate_limit_error(e)
+                is_timeout = isinstance(e, WHITE_AGENT_TIMEOUT_ERRORS) or (
+                    "timeout" in str(e).lower()
                 )
-                is_timeout = "timeout" in error_str or isinstance(e, TimeoutError)
 
                 if is_timeout:
                     error_message = f"White agent timed out: {str(e)}"
-                    logger.error(f"[Task {task_idx}] {error_message}")
+                    logger.error("[Task %s] %s", task_idx, error_message)
                     break
 
                 if is_rate_limit:
-                    # Rate limit hit - increase delay exponentially
-                    consecutive_successes = 0
-                    old_delay = current_delay
-                    current_delay = min(max_delay, current_delay * 2)
-                    logger.warning(
-                        f"[Task {task_idx}] Rate limit hit, increasing step delay from {old_delay:.1f}s to {current_delay:.1f}s"
-                    )
-                    # Wait extra time before retry
-                    await asyncio.sleep(current_delay)
+                    # Rate limit hit - halve the shared step rate for all tasks
+                    if self._step_limiter is None:
+                        logger.warning(
+                            "[Task %s] Rate limit hit, backing off", task_idx
+                        )
+                    elif not throttled:
+                        logger.warning(
+                            "[Task %s] Rate limit hit, halving white agent step rate for %ss",
+                            task_idx,
+                            WHITE_AGENT_THROTTLE_PERIOD,
+                        )
+                    self._throttled_until = loop.time() + WHITE_AGENT_THROTTLE_PERIOD
+                    backoff = min(max_backoff, max(step_delay, backoff * 2))
                     continue  # Retry this step
 
                 error_message = f"Failed to communicate with white agent: {str(e)}"
-                logger.error(f"[Task {task_idx}] {error_message}")
+                logger.error("[Task %s] %s", task_idx, error_message)
                 break
 
             # Parse response
@@ -714,12 +879,12 @@ What should we do next?"""
                 tool = action.get("tool", "finish")
                 params = action.get("params", {})
 
-                thoughts.append(f"Step {step_count}: {thought}")
+                step_thoughts.append((step_count, thought))
 
-                logger.info(f"[Task {task_idx}] Parsed action:")
-                logger.info(f"  Thought: {thought}")
-                logger.info(f"  Tool: {tool}")
-                logger.info(f"  Params: {params}")
+                logger.info("[Task %s] Parsed action:", task_idx)
+                logger.info("  Thought: %s", thought)
+                logger.info("  Tool: %s", tool)
+                logger.info("  Params: %s", params)
 
                 if os.getenv("SAVE_DEBUG_RESPONSES", "false").lower() in (
                     "true",
@@ -727,16 +892,19 @@ What should we do next?"""
                     "yes",
                 ):
                     debug_response_path = f"{browser_agent.output_dir}/step_{step_count:03d}_response.json"
-                    Path(debug_response_path).write_text(json.dumps(action, indent=2))
+                    await asyncio.to_thread(
+                        Path(debug_response_path).write_bytes,
+                        orjson.dumps(action, option=orjson.OPT_INDENT_2),
+                    )
 
             except Exception as e:
                 error_message = f"Failed to parse white agent response: {str(e)}"
-                logger.error(f"[Task {task_idx}] {error_message}")
+                logger.error("[Task %s] %s", task_idx, error_message)
                 break
 
             # Check if finished
             if tool == "finish":
-                logger.info(f"[Task {task_idx}] Task completed")
+                logger.info("[Task %s] Task completed", task_idx)
                 success = True
                 break
 
@@ -745,14 +913,19 @@ What should we do next?"""
                 error_type = params.get("error_type", "unknown")
                 consecutive_parse_errors += 1
                 logger.warning(
-                    f"[Task {task_idx}] Parse error ({error_type}), attempt {consecutive_parse_errors}/{MAX_CONSECUTIVE_PARSE_ERRORS}"
+                    "[Task %s] Parse error (%s), attempt %s/%s",
+                    task_idx,
+                    error_type,
+                    consecutive_parse_errors,
+                    MAX_CONSECUTIVE_PARSE_ERRORS,
                 )
 
                 # After too many consecutive parse errors, give up on this task
                 if consecutive_parse_errors >= MAX_CONSECUTIVE_PARSE_ERRORS:
                     logger.error(
-                        f"[Task {task_idx}] Too many consecutive parse errors ({consecutive_parse_errors}), "
-                        f"marking task as failed and moving on"
+                        "[Task %s] Too many consecutive parse errors (%s), marking task as failed and moving on",
+                        task_idx,
+                        consecutive_parse_errors,
                     )
                     error_message = f"Task failed after {consecutive_parse_errors} consecutive parse errors"
                     break
@@ -765,23 +938,30 @@ What should we do next?"""
 
             # Execute action
             try:
-                logger.info(f"[Task {task_idx}] Executing: {tool} with params {params}")
+                logger.info(
+                    "[Task %s] Executing: %s with params %s", task_idx, tool, params
+                )
+                snapshot = None  # Any action may change the page
                 result = await browser_agent.execute_action(tool, **params)
 
                 if result.get("browser_closed", False):
                     browser_closed = True
-                    logger.warning(f"[Task {task_idx}] Browser close detected")
+                    logger.warning("[Task %s] Browser close detected", task_idx)
 
                     if len(browser_agent.action_history) > 0:
                         success = True
                         logger.warning(
-                            f"[Task {task_idx}] Setting success=True after {len(browser_agent.action_history)} actions"
+                            "[Task %s] Setting success=True after %s actions",
+                            task_idx,
+                            len(browser_agent.action_history),
                         )
                     break
 
                 if not result.get("success", False):
                     action_error = result.get("error", "Unknown error")
-                    logger.warning(f"[Task {task_idx}] Action failed: {action_error}")
+                    logger.warning(
+                        "[Task %s] Action failed: %s", task_idx, action_error
+                    )
 
                     error_feedback = f"""Your previous action failed with error:
 {action_error}
@@ -796,11 +976,11 @@ Most interactive tools require BOTH:
 
 Try again with the correct parameters."""
                 else:
-                    logger.info(f"[Task {task_idx}] Action executed successfully")
+                    logger.info("[Task %s] Action executed successfully", task_idx)
 
             except Exception as e:
                 error_message = f"Exception during action execution: {str(e)}"
-                logger.error(f"[Task {task_idx}] {error_message}")
+                logger.error("[Task %s] %s", task_idx, error_message)
                 if "closed" in str(e).lower() or "disconnected" in str(e).lower():
                     browser_closed = True
                     if len(browser_agent.action_history) > 0:
@@ -808,12 +988,12 @@ Try again with the correct parameters."""
                     break
 
         if step_count >= max_steps and not success:
-            logger.info(f"[Task {task_idx}] Reached max steps without completion")
+            logger.info("[Task %s] Reached max steps without completion", task_idx)
 
         if browser_closed:
-            logger.info(f"[Task {task_idx}] Terminated due to browser close")
+            logger.info("[Task %s] Terminated due to browser close", task_idx)
 
-        return success, step_count, thoughts, error_message
+        return success, step_count, step_thoughts, error_message
 
     def _log_evaluation_summary(
         self,
@@ -834,31 +1014,15 @@ Try again with the correct parameters."""
         logger.info(f"Steps taken: {step_count}/{max_steps}")
         logger.info("Thoughts:")
         for i, thought in enumerate(thoughts, 1):
-            logger.info(f"  {i}. {thought}")
+            logger.info("  %d. %s", i, thought)
         logger.info(f"Action history: {action_history}")
         if error_message:
             logger.info(f"Error: {error_message}")
         logger.info("=" * 60)
 
 
-def browser_judge_agent_card(agent_name: str, card_url: str) -> AgentCard:
-    """
-    Create the agent card for the Browser Judge.
-
-    Args:
-        agent_name: Name of the agent
-        card_url: URL where the agent is accessible
-
-    Returns:
-        AgentCard describing the agent's capabilities
-    """
-    skill = AgentSkill(
-        id="evaluate_web_agent",
-        name="Evaluates web automation agents",
-        description="Evaluates a white agent on web browsing tasks using real browser automation.",
-        tags=["web", "browser", "evaluation", "playwright", "automation"],
-        examples=[
-            """{
+# Static parts of the agent card, built once at import
+_EXAMPLE_REQUEST = """{
   "participants": {
     "white_agent": "http://127.0.0.1:9019"
   },
@@ -880,9 +1044,27 @@ def browser_judge_agent_card(agent_name: str, card_url: str) -> AgentCard:
     }
   ]
 }"""
-        ],
-    )
 
+_EVALUATE_SKILL = AgentSkill(
+    id="evaluate_web_agent",
+    name="Evaluates web automation agents",
+    description="Evaluates a white agent on web browsing tasks using real browser automation.",
+    tags=["web", "browser", "evaluation", "playwright", "automation"],
+    examples=[_EXAMPLE_REQUEST],
+)
+
+
+def browser_judge_agent_card(agent_name: str, card_url: str) -> AgentCard:
+    """
+    Create the agent card for the Browser Judge.
+
+    Args:
+        agent_name: Name of the agent
+        card_url: URL where the agent is accessible
+
+    Returns:
+        AgentCard describing the agent's capabilities
+    """
     agent_card = AgentCard(
         name=agent_name,
         description="Evaluates web automation agents on browser-based tasks using Playwright.",
@@ -891,7 +1073,7 @@ def browser_judge_agent_card(agent_name: str, card_url: str) -> AgentCard:
         default_input_modes=["text"],
         default_output_modes=["text"],
         capabilities=AgentCapabilities(streaming=True),
-        skills=[skill],
+        skills=[_EVALUATE_SKILL],
     )
 
     return agent_card
@@ -977,4 +1159,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    event_loop.run(main())
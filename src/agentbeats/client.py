@@ -1,14 +1,43 @@
 import asyncio
+import contextlib
 import logging
+import re
 from uuid import uuid4
 
 import httpx
 from a2a.client import A2ACardResolver, ClientConfig, ClientFactory, Consumer
-from a2a.types import DataPart, FilePart, FileWithBytes, Message, Part, Role, TextPart
+from a2a.client.errors import A2AClientHTTPError
+from a2a.types import (
+    AgentCard,
+    DataPart,
+    FilePart,
+    FileWithBytes,
+    Message,
+    Part,
+    Role,
+    TextPart,
+)
 
 DEFAULT_TIMEOUT = 300
 logger = logging.getLogger(__name__)
 
+_RATE_LIMIT_RE = re.compile(r"429|resource_exhausted|too many requests", re.IGNORECASE)
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """
+    Whether an error from talking to an agent means it was rate limited.
+
+    HTTP errors with status 429 always count. Any other error, HTTP or not,
+    falls back to matching the error text, since agents may relay their
+    LLM's RESOURCE_EXHAUSTED error as a 500/503 or a failed task.
+    """
+    if isinstance(error, A2AClientHTTPError) and error.status_code == 429:
+        return True
+    if isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 429:
+        return True
+    return _RATE_LIMIT_RE.search(str(error)) is not None
+
 
 def create_message(
     *,
@@ -52,6 +81,8 @@ async def send_message(
     consumer: Consumer | None = None,
     max_retries: int = 3,
     parts: list[Part] = None,
+    httpx_client: httpx.AsyncClient | None = None,
+    agent_cards: dict[str, AgentCard] | None = None,
 ):
     """
     Returns dict with context_id, response and status (if exists).
@@ -65,15 +96,31 @@ async def send_message(
         streaming: Whether to use streaming mode
         consumer: Optional event consumer
         max_retries: Maximum number of retry attempts for rate limit errors
+        parts: Optional list of Part objects for multimodal messages
+        httpx_client: Optional client to send through (left open); by default
+            a client is created for this call and closed afterwards
+        agent_cards: Optional base_url -> AgentCard cache; a cached card skips
+            the card fetch, and a fetched card is stored in it
     """
     retry_count = 0
     base_delay = 2  # Start with 2 seconds
 
-    while retry_count <= max_retries:
-        try:
-            async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as httpx_client:
-                resolver = A2ACardResolver(httpx_client=httpx_client, base_url=base_url)
-                agent_card = await resolver.get_agent_card()
+    # One client for every attempt, so retries reuse pooled connections
+    if httpx_client is None:
+        client_cm = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT)
+    else:
+        client_cm = contextlib.nullcontext(httpx_client)
+    async with client_cm as httpx_client:
+        while retry_count <= max_retries:
+            try:
+                agent_card = agent_cards.get(base_url) if agent_cards else None
+                if agent_card is None:
+                    resolver = A2ACardResolver(
+                        httpx_client=httpx_client, base_url=base_url
+                    )
+                    agent_card = await resolver.get_agent_card()
+                    if agent_cards is not None:
+                        agent_cards[base_url] = agent_card
                 config = ClientConfig(
                     httpx_client=httpx_client,
                     streaming=streaming,
@@ -113,28 +160,23 @@ async def send_message(
 
                 return outputs
 
-        except Exception as e:
-            error_str = str(e).lower()
-            # Check if this is a rate limit error (429 or RESOURCE_EXHAUSTED)
-            is_rate_limit = (
-                "429" in error_str
-                or "resource_exhausted" in error_str
-                or "too many requests" in error_str
-            )
-
-            if is_rate_limit and retry_count < max_retries:
-                # Calculate exponential backoff delay
-                delay = base_delay * (2**retry_count)
-                logger.warning(
-                    f"Rate limit hit (429). Retrying in {delay} seconds... "
-                    f"(Attempt {retry_count + 1}/{max_retries})"
-                )
-                await asyncio.sleep(delay)
-                retry_count += 1
-            else:
-                # Not a rate limit error, or we've exhausted retries
-                if is_rate_limit:
-                    logger.error(
-                        f"Rate limit error persisted after {max_retries} retries"
+            except Exception as e:
+                # Check if this is a rate limit error (429 or RESOURCE_EXHAUSTED)
+                is_rate_limit = is_rate_limit_error(e)
+
+                if is_rate_limit and retry_count < max_retries:
+                    # Calculate exponential backoff delay
+                    delay = base_delay * (2**retry_count)
+                    logger.warning(
+                        f"Rate limit hit (429). Retrying in {delay} seconds... "
+                        f"(Attempt {retry_count + 1}/{max_retries})"
                     )
-                raise
+                    await asyncio.sleep(delay)
+                    retry_count += 1
+                else:
+                    # Not a rate limit error, or we've exhausted retries
+                    if is_rate_limit:
+                        logger.error(
+                            f"Rate limit error persisted after {max_retries} retries"
+                        )
+                    raise
@@ -1,4 +1,3 @@
-import asyncio
 import json
 import sys
 import tomllib
@@ -17,6 +16,7 @@ from a2a.types import (
 
 from agentbeats.client import send_message
 from agentbeats.models import EvalRequest
+from utils import event_loop
 
 
 def parse_toml(d: dict[str, Any]) -> tuple[EvalRequest, str]:
@@ -93,16 +93,8 @@ async def event_consumer(event, card: AgentCard):
             print("Unhandled event")
 
 
-async def main():
-    if len(sys.argv) < 2:
-        print("Usage: python client_cli.py <scenario.toml>")
-        sys.exit(1)
-
-    path = Path(sys.argv[1])
-    if not path.exists():
-        print(f"File not found: {path}")
-        sys.exit(1)
-
+async def run_scenario_client(path: Path):
+    """Send the scenario's evaluation request to the green agent and print events."""
     toml_data = path.read_text()
     data = tomllib.loads(toml_data)
 
@@ -117,5 +109,18 @@ async def main():
     print("Evaluation completed.")
 
 
+async def main():
+    if len(sys.argv) < 2:
+        print("Usage: python client_cli.py <scenario.toml>")
+        sys.exit(1)
+
+    path = Path(sys.argv[1])
+    if not path.exists():
+        print(f"File not found: {path}")
+        sys.exit(1)
+
+    await run_scenario_client(path)
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    event_loop.run(main())
@@ -1,5 +1,6 @@
 import argparse
 import asyncio
+import contextlib
 import os
 import shlex
 import signal
@@ -7,18 +8,26 @@ import subprocess
 import sys
 import time
 import tomllib
-from datetime import datetime
+import traceback
+from functools import lru_cache
 from pathlib import Path
 
-import httpx
-from a2a.client import A2ACardResolver
 from dotenv import load_dotenv
 
+from utils import event_loop
+
 load_dotenv(override=True)
 
+# Seconds between agent readiness probes
+READY_POLL_INTERVAL = 0.5
+
+# Seconds agents get to exit after SIGTERM before they are killed
+STOP_GRACE_PERIOD = 5.0
 
+
+@lru_cache(maxsize=1)
 def get_log_dir() -> Path:
-    """Get the log directory path and create it if it doesn't exist."""
+    """Get the log directory path, creating it on the first call."""
     log_dir = Path(os.getenv("LOG_DIR", ".logs"))
     log_dir.mkdir(exist_ok=True)
     return log_dir
@@ -76,38 +85,79 @@ async def wait_for_agents(cfg: dict, timeout: int = 30) -> bool:
     if not endpoints:
         return True  # No agents to wait for
 
+    # Imported here so --help and config errors don't pay for the A2A client
+    import httpx
+    from a2a.client import A2ACardResolver
+
     print(f"Waiting for {len(endpoints)} agent(s) to be ready...")
     start_time = time.time()
 
-    async def check_endpoint(endpoint: str) -> bool:
+    async def check_endpoint(client: httpx.AsyncClient, endpoint: str) -> bool:
         """Check if an endpoint is responding by fetching the agent card."""
         try:
-            async with httpx.AsyncClient(timeout=2) as client:
-                resolver = A2ACardResolver(httpx_client=client, base_url=endpoint)
-                await resolver.get_agent_card()
-                return True
+            resolver = A2ACardResolver(httpx_client=client, base_url=endpoint)
+            await resolver.get_agent_card()
+            return True
         except Exception:
             # Any exception means the agent is not ready
             return False
 
-    while time.time() - start_time < timeout:
-        ready_count = 0
-        for endpoint in endpoints:
-            if await check_endpoint(endpoint):
-                ready_count += 1
-
-        if ready_count == len(endpoints):
-            return True
+    # Probe all pending endpoints at once; ready ones are not checked again.
+    # One client is shared by every probe so connections are pooled.
+    pending = endpoints
+    async with httpx.AsyncClient(timeout=2) as client:
+        while time.time() - start_time < timeout:
+            results = await asyncio.gather(
+                *(check_endpoint(client, e) for e in pending)
+            )
+            pending = [e for e, ready in zip(pending, results) if not ready]
+            if not pending:
+                return True
 
-        print(f"  {ready_count}/{len(endpoints)} agents ready, waiting...")
-        await asyncio.sleep(1)
+            ready_count = len(endpoints) - len(pending)
+            print(f"  {ready_count}/{len(endpoints)} agents ready, waiting...")
+            await asyncio.sleep(READY_POLL_INTERVAL)
 
     print(
-        f"Timeout: Only {ready_count}/{len(endpoints)} agents became ready after {timeout}s"
+        f"Timeout: Only {len(endpoints) - len(pending)}/{len(endpoints)} agents "
+        f"became ready after {timeout}s"
     )
     return False
 
 
+def _signal_group(proc: subprocess.Popen, sig: signal.Signals) -> None:
+    """Send a signal to a process's group (agents may spawn browsers)."""
+    try:
+        os.killpg(proc.pid, sig)
+    except ProcessLookupError:
+        pass
+
+
+def stop_processes(procs: list[subprocess.Popen], grace: float = STOP_GRACE_PERIOD):
+    """
+    Terminate agent process groups, escalating to SIGKILL after a grace period.
+
+    All groups get SIGTERM at once and share one deadline, so shutdown takes
+    at most grace seconds plus the SIGKILL reap, and returns as soon as every
+    agent has exited.
+    """
+    running = [p for p in procs if p.poll() is None]
+    for p in running:
+        _signal_group(p, signal.SIGTERM)
+
+    deadline = time.monotonic() + grace
+    for p in running:
+        try:
+            p.wait(timeout=max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            pass
+
+    for p in running:
+        if p.poll() is None:
+            _signal_group(p, signal.SIGKILL)
+            p.wait()
+
+
 def parse_toml(scenario_path: str) -> dict:
     path = Path(scenario_path)
     if not path.exists():
@@ -178,7 +228,7 @@ def main():
     cfg = parse_toml(args.scenario)
 
     # Create timestamped log files
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
     log_dir = get_log_dir()
 
     # Show logs either in terminal or to DEVNULL, but always write to files
@@ -261,7 +311,7 @@ def main():
             )
 
         # Wait for all agents to be ready
-        if not asyncio.run(wait_for_agents(cfg)):
+        if not event_loop.run(wait_for_agents(cfg)):
             print("Error: Not all agents became ready. Exiting.")
             return
 
@@ -286,35 +336,26 @@ def main():
                 output_sink = log_file
                 error_sink = log_file
 
-            client_proc = subprocess.Popen(
-                [sys.executable, "-m", "agentbeats.client_cli", args.scenario],
-                env=base_env,
-                stdout=output_sink,
-                stderr=error_sink,
-                text=True,
-                start_new_session=True,
-            )
-            procs.append(client_proc)
-            client_proc.wait()
+            # The client only sends one A2A request and prints streamed events,
+            # so run it on an event loop in this process instead of spawning
+            # another interpreter
+            from agentbeats.client_cli import run_scenario_client
+
+            with (
+                contextlib.redirect_stdout(output_sink),
+                contextlib.redirect_stderr(error_sink),
+            ):
+                try:
+                    event_loop.run(run_scenario_client(Path(args.scenario)))
+                except Exception:
+                    traceback.print_exc()
 
     except KeyboardInterrupt:
         pass
 
     finally:
         print("\nShutting down...")
-        for p in procs:
-            if p.poll() is None:
-                try:
-                    os.killpg(p.pid, signal.SIGTERM)
-                except ProcessLookupError:
-                    pass
-        time.sleep(1)
-        for p in procs:
-            if p.poll() is None:
-                try:
-                    os.killpg(p.pid, signal.SIGKILL)
-                except ProcessLookupError:
-                    pass
+        stop_processes(procs)
 
         # Close all log files
         for log_file in log_files:
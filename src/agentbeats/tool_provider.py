@@ -1,11 +1,20 @@
+import httpx
 from a2a.types import Part
 
 from agentbeats.client import send_message
 
 
 class ToolProvider:
-    def __init__(self):
+    def __init__(self, httpx_client: httpx.AsyncClient | None = None):
+        """
+        Args:
+            httpx_client: Optional shared client for all messages; the caller
+                owns it and closes it. By default each message opens its own.
+        """
         self._context_ids = {}
+        self._httpx_client = httpx_client
+        # Agent cards by URL, fetched once instead of before every message
+        self._agent_cards = {}
 
     async def talk_to_agent(
         self,
@@ -32,6 +41,8 @@ class ToolProvider:
             base_url=url,
             context_id=None if new_conversation else self._context_ids.get(url, None),
             parts=parts,
+            httpx_client=self._httpx_client,
+            agent_cards=self._agent_cards,
         )
         if outputs.get("status", "completed") != "completed":
             raise RuntimeError(f"{url} responded with: {outputs}")
@@ -3,6 +3,7 @@ import io
 import logging
 import os
 import random
+import re
 import time
 
 from google.api_core.exceptions import ResourceExhausted, ServiceUnavailable
@@ -10,6 +11,13 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 
 logger = logging.getLogger(__name__)
 
+# Matches rate limit / quota errors: 429, RESOURCE_EXHAUSTED, quota, or
+# "rate" and "limit" anywhere in the message
+_RATE_LIMIT_RE = re.compile(
+    r"429|resource_exhausted|quota|rate.*limit|limit.*rate",
+    re.IGNORECASE | re.DOTALL,
+)
+
 
 def encode_image(image):
     """Convert a PIL image to base64 string."""
@@ -177,13 +185,7 @@ class OpenaiEngine:
 
             except Exception as e:
                 # Check if it's a rate limit error in disguise
-                error_str = str(e).lower()
-                is_rate_limit = (
-                    "429" in error_str
-                    or "resource_exhausted" in error_str
-                    or "quota" in error_str
-                    or ("rate" in error_str and "limit" in error_str)
-                )
+                is_rate_limit = _RATE_LIMIT_RE.search(str(e)) is not None
 
                 if is_rate_limit and attempt < max_retries:
                     last_exception = e
@@ -3,6 +3,13 @@ import os
 MAX_HTML_CONTEXT_LENGTH = 40000  # Increased from 25K for more page context
 MAX_PARALLEL_TASKS = int(os.getenv("MAX_PARALLEL_TASKS", "1"))  # Increased from 1 to 2
 
+# White agent steps per minute, shared by all parallel tasks; 0 (the default)
+# disables the shared limiter, leaving each task's step_delay as the pause
+# between steps. While limiting, a rate limit error halves the rate for
+# WHITE_AGENT_THROTTLE_PERIOD s. Negative values count as 0
+WHITE_AGENT_RPM = max(0, int(os.getenv("WHITE_AGENT_RPM", "0")))
+WHITE_AGENT_THROTTLE_PERIOD = 60
+
 TASK_RESULT_OUTPUT_DIR = ".output/results"
 TASK_RESULT_FILE_NAME = "result"
 TASK_RESULT_SCREENSHOTS_FOLDER = "trajectory"
@@ -90,25 +90,8 @@ def build_tools_reminder(tools: List[Dict[str, Any]]) -> str:
 class BrowserJudgePrompts:
     """Collection of prompt templates for web automation tasks."""
 
-    @classmethod
-    def task_run_prompt(
-        cls, task_description: str, website: str, tools: List[Dict[str, Any]] = None
-    ) -> str:
-        """
-        Generate the main task execution prompt with dynamic tools.
-
-        Args:
-            task_description: Description of the task to be performed
-            website: Current website URL
-            tools: List of tool schemas from MCP server (optional)
-
-        Returns:
-            Formatted prompt string
-        """
-        # Format tools dynamically from MCP server
-        tools_section = build_tools_prompt(tools) if tools else "TOOLS: Not available"
-
-        return f"""You are a web automation agent. Your task is:
+    # Main task prompt; filled with str.format, so literal braces are doubled
+    TASK_RUN_TEMPLATE = """You are a web automation agent. Your task is:
 
 TASK: {task_description}
 
@@ -185,6 +168,39 @@ IMPORTANT NOTES:
 CURRENT PAGE SNAPSHOT:
 """
 
+    @classmethod
+    def task_run_prompt(
+        cls,
+        task_description: str,
+        website: str,
+        tools: List[Dict[str, Any]] = None,
+        tools_section: str | None = None,
+    ) -> str:
+        """
+        Generate the main task execution prompt with dynamic tools.
+
+        Args:
+            task_description: Description of the task to be performed
+            website: Current website URL
+            tools: List of tool schemas from MCP server (optional)
+            tools_section: Already formatted build_tools_prompt(tools) output,
+                to avoid formatting the tools twice (optional)
+
+        Returns:
+            Formatted prompt string
+        """
+        # Format tools dynamically from MCP server
+        if tools_section is None:
+            tools_section = (
+                build_tools_prompt(tools) if tools else "TOOLS: Not available"
+            )
+
+        return cls.TASK_RUN_TEMPLATE.format(
+            task_description=task_description,
+            website=website,
+            tools_section=tools_section,
+        )
+
 
 def get_task_run_prompt(task_description: str, website: str) -> str:
     """
@@ -14,6 +14,14 @@ from shared.mcp_client import MCPBrowserClient
 
 logger = logging.getLogger(__name__)
 
+# JPEG SOI marker, used to tell JPEG screenshot payloads from PNG ones
+JPEG_MAGIC = b"\xff\xd8"
+
+# Tool names (lowercased) that execute_action intercepts instead of counting
+# them as steps or running them on the browser
+SNAPSHOT_TOOLS = frozenset({"browser_snapshot", "snapshot"})
+CLOSE_TOOLS = frozenset({"browser_close", "close", "browser_quit", "quit"})
+
 
 class BrowserAgent:
     """
@@ -25,7 +33,11 @@ class BrowserAgent:
     - Takes screenshots
     """
 
-    def __init__(self, output_dir: str = "./output"):
+    def __init__(
+        self,
+        output_dir: str = "./output",
+        mcp_client: Optional[MCPBrowserClient] = None,
+    ):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True, parents=True)
 
@@ -36,24 +48,31 @@ class BrowserAgent:
         self.current_url: str = ""
         self.screenshot_failures: int = 0
 
-        # MCP client for browser automation
-        self.mcp_client: Optional[MCPBrowserClient] = None
+        # Last encoded screenshot, keyed by (screenshot count, max_width, quality)
+        self._encoded_screenshot_key: Optional[tuple[int, int, int]] = None
+        self._encoded_screenshot: Optional[tuple[str, str]] = None
+
+        # MCP client for browser automation. A client passed in is shared with
+        # later tasks: stop() only resets its browser instead of shutting it down
+        self.mcp_client: Optional[MCPBrowserClient] = mcp_client
+        self._owns_mcp_client = mcp_client is None
 
     async def start(self, url: str):
-        """Start browser via MCP and navigate to URL"""
-        logger.info("🚀 Starting MCP browser client...")
+        """Start browser via MCP (reusing a running shared client) and navigate to URL"""
+        if self.mcp_client is None:
+            self.mcp_client = MCPBrowserClient()
 
-        # Initialize and start MCP client
-        self.mcp_client = MCPBrowserClient()
-        await self.mcp_client.start()
+        if not self.mcp_client.is_running:
+            logger.info("🚀 Starting MCP browser client...")
+            await self.mcp_client.start()
 
-        logger.info("Installing browser")
-        try:
-            await self.mcp_client.call_tool("browser_install")
-        except Exception as e:
-            logger.info("Failed to install browser")
-            logger.error(e)
-            raise
+            logger.info("Installing browser")
+            try:
+                await self.mcp_client.call_tool("browser_install")
+            except Exception as e:
+                logger.info("Failed to install browser")
+                logger.error(e)
+                raise
 
         logger.info(f"🌐 Navigating to: {url}")
 
@@ -88,12 +107,19 @@ class BrowserAgent:
         print(f"✓ MCP Browser ready at {url}")
 
     async def stop(self):
-        """Stop MCP browser client and clean up resources"""
-        if self.mcp_client:
+        """Stop MCP browser client (or reset a shared one) and clean up resources"""
+        if not self.mcp_client:
+            logger.warning("MCP client was not initialized")
+        elif self._owns_mcp_client:
             await self.mcp_client.stop()
             print("🛑 MCP Browser client stopped")
-        else:
-            logger.warning("MCP client was not initialized")
+        elif self.mcp_client.is_running:
+            try:
+                await self.mcp_client.reset_browser()
+            except Exception as e:
+                # Don't hand a half-reset browser to the next task
+                logger.warning(f"Failed to reset MCP browser, stopping it: {e}")
+                await self.mcp_client.stop()
 
     async def execute_action(self, tool_name: str, **params) -> Dict[str, Any]:
         """
@@ -110,14 +136,10 @@ class BrowserAgent:
             return {"success": False, "error": "MCP client not started"}
 
         result = {"success": False, "tool": tool_name, "params": params}
+        tool_lower = tool_name.lower()
 
         # INTERCEPT: Check if this is a snapshot request (read-only, not a user action)
-        is_snapshot_action = tool_name.lower() in [
-            "browser_snapshot",
-            "snapshot",
-        ]
-
-        if is_snapshot_action:
+        if tool_lower in SNAPSHOT_TOOLS:
             # Don't increment step_count - this is not a user action
             logger.info(f"Snapshot request: {tool_name.upper()} (not counting as step)")
 
@@ -142,14 +164,7 @@ class BrowserAgent:
         logger.info(f"Step {self.step_count}: {tool_name.upper()}")
 
         # INTERCEPT: Check if this is a browser close request
-        is_close_action = tool_name.lower() in [
-            "browser_close",
-            "close",
-            "browser_quit",
-            "quit",
-        ]
-
-        if is_close_action:
+        if tool_lower in CLOSE_TOOLS:
             # DO NOT execute close on MCP/Playwright
             # Just record it and signal shutdown
             logger.warning(
@@ -181,7 +196,7 @@ class BrowserAgent:
             result["mcp_response"] = mcp_result
 
             # Track URL changes for navigation actions
-            if "navigate" in tool_name.lower() or "goto" in tool_name.lower():
+            if "navigate" in tool_lower or "goto" in tool_lower:
                 self.current_url = params.get("url", self.current_url)
 
             # Record action in Mind2Web format for evaluation
@@ -313,13 +328,9 @@ class BrowserAgent:
             screenshot_dir.mkdir(parents=True, exist_ok=True)
             screenshot_path = screenshot_dir / f"{name}.jpg"
 
-            # Convert PNG to JPEG for smaller file size
             image_bytes = base64.b64decode(image_data)
-            img = Image.open(io.BytesIO(image_bytes))
-            # Convert to RGB if necessary (PNG may have alpha channel)
-            if img.mode in ("RGBA", "P"):
-                img = img.convert("RGB")
-            img.save(screenshot_path, format="JPEG", quality=85, optimize=True)
+            # Off the event loop so parallel tasks aren't blocked on the write
+            await asyncio.to_thread(self._save_screenshot, image_bytes, screenshot_path)
 
             # Track in screenshots list
             path_str = str(screenshot_path)
@@ -333,6 +344,22 @@ class BrowserAgent:
             logger.error(f"Failed to take screenshot via MCP: {e}")
             return None
 
+    @staticmethod
+    def _save_screenshot(image_bytes: bytes, screenshot_path: Path) -> None:
+        """Write screenshot bytes from the MCP server to disk as JPEG."""
+        if image_bytes.startswith(JPEG_MAGIC):
+            # Already JPEG (we ask for type=jpeg), so skip the decode and
+            # re-encode and store the server's bytes as-is
+            screenshot_path.write_bytes(image_bytes)
+            return
+
+        # Convert PNG to JPEG for smaller file size
+        img = Image.open(io.BytesIO(image_bytes))
+        # Convert to RGB if necessary (PNG may have alpha channel)
+        if img.mode in ("RGBA", "P"):
+            img = img.convert("RGB")
+        img.save(screenshot_path, format="JPEG", quality=85, optimize=True)
+
     def get_action_history(self) -> List[str]:
         """Get action history"""
         return self.action_history.copy()
@@ -346,7 +373,9 @@ class BrowserAgent:
     ) -> tuple[str, str] | None:
         """
         Get the latest screenshot as base64-encoded string.
-        Compresses and resizes the image to reduce payload size.
+        Compresses and resizes the image to reduce payload size. The result is
+        reused until a new screenshot is taken, so steps that don't change the
+        page (retries, parse errors) skip the decode/re-encode.
 
         Args:
             max_width: Maximum width for resizing (default: 1280px)
@@ -359,6 +388,9 @@ class BrowserAgent:
             return None
 
         latest_screenshot_path = self.screenshots[-1]
+        cache_key = (len(self.screenshots), max_width, quality)
+        if cache_key == self._encoded_screenshot_key:
+            return self._encoded_screenshot
 
         try:
             # Open and resize image
@@ -368,6 +400,9 @@ class BrowserAgent:
             if img.width > max_width:
                 ratio = max_width / img.width
                 new_height = int(img.height * ratio)
+                # For JPEGs, let the decoder downscale by a power of two first
+                # so the resize below works on far fewer pixels
+                img.draft("RGB", (max_width, new_height))
                 img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
 
             # Convert to RGB if necessary (JPEG doesn't support transparency)
@@ -380,20 +415,23 @@ class BrowserAgent:
                 )
                 img = background
 
-            # Save to bytes as JPEG with compression
+            # Save to bytes as JPEG with compression. optimize=True costs an
+            # extra Huffman pass for a few percent of bytes, not worth it per step
             buffer = io.BytesIO()
-            img.save(buffer, format="JPEG", quality=quality, optimize=True)
+            img.save(buffer, format="JPEG", quality=quality)
             image_bytes = buffer.getvalue()
 
             # Encode to base64
-            base64_string = base64.b64encode(image_bytes).decode("utf-8")
+            base64_string = base64.b64encode(image_bytes).decode("ascii")
 
             logger.info(
                 f"Encoded screenshot {Path(latest_screenshot_path).name}: "
                 f"{len(image_bytes)} bytes (JPEG {quality}% quality, {img.width}x{img.height})"
             )
 
-            return base64_string, latest_screenshot_path
+            self._encoded_screenshot_key = cache_key
+            self._encoded_screenshot = (base64_string, latest_screenshot_path)
+            return self._encoded_screenshot
         except Exception as e:
             logger.error(f"Failed to encode screenshot {latest_screenshot_path}: {e}")
             return None
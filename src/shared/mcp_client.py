@@ -8,7 +8,9 @@ enabling browser automation via the Model Context Protocol.
 import asyncio
 import json
 import logging
+import os
 import platform
+import shutil
 import subprocess
 import tempfile
 import uuid
@@ -81,13 +83,25 @@ class MCPBrowserClient:
             f"MCPBrowserClient initialized with instance_id: {self._instance_id}"
         )
 
+    @property
+    def is_running(self) -> bool:
+        """Whether the MCP server process is alive and initialized."""
+        return (
+            self._initialized
+            and self.server_process is not None
+            and self.server_process.poll() is None
+        )
+
     async def start(self) -> None:
         """
         Start the MCP server subprocess with an isolated browser instance.
         """
         if self.server_process is not None:
-            logger.warning("MCP server already running")
-            return
+            if self.server_process.poll() is None:
+                logger.warning("MCP server already running")
+                return
+            # Previous server exited on its own; clean it up and start a new one
+            await self.stop()
 
         async with _startup_lock:
             await self._start_server_internal()
@@ -150,8 +164,6 @@ class MCPBrowserClient:
     async def _cleanup_user_data_dir(self) -> None:
         """Clean up the temporary user data directory."""
         if self._user_data_dir:
-            import shutil
-
             try:
                 shutil.rmtree(self._user_data_dir, ignore_errors=True)
                 logger.info(f"Cleaned up user data directory: {self._user_data_dir}")
@@ -159,6 +171,18 @@ class MCPBrowserClient:
                 logger.warning(f"Failed to clean up user data directory: {e}")
             self._user_data_dir = None
 
+    async def reset_browser(self) -> None:
+        """
+        Close the browser and wipe its profile, keeping the MCP server running.
+
+        The next tool call relaunches a clean browser, so the client can be
+        reused for another task without paying for a new server process.
+        """
+        await self.call_tool("browser_close")
+        if self._user_data_dir:
+            await asyncio.to_thread(shutil.rmtree, self._user_data_dir, True)
+            os.makedirs(self._user_data_dir, exist_ok=True)
+
     async def stop(self) -> None:
         """
         Stop the MCP server subprocess and clean up resources.
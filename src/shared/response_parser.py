@@ -1,13 +1,17 @@
 """Response parser utilities for parsing white agent responses."""
 
-import json
 import logging
+import re
 from typing import Any, Dict
 
-from utils.common_utils import parse_tags
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Only the <json> block matters here, so match it directly instead of every
+# <tag>...</tag> pair in the response
+_JSON_TAG_RE = re.compile(r"<json>(.*?)</json>", re.DOTALL)
+
 
 def parse_white_agent_response(response_text: str) -> Dict[str, Any]:
     """
@@ -42,12 +46,13 @@ def parse_white_agent_response(response_text: str) -> Dict[str, Any]:
     # Parse JSON with <json></json> tags ONLY
     # Markdown code fences are NOT accepted - agents must follow format instructions
     try:
-        tags = parse_tags(response_text)
-        if "json" in tags:
-            action_dict = json.loads(tags["json"])
-            logger.debug(f"Parsed JSON format: {action_dict}")
+        # Last block wins if the agent wrote more than one
+        json_blocks = _JSON_TAG_RE.findall(response_text)
+        if json_blocks:
+            action_dict = orjson.loads(json_blocks[-1].strip())
+            logger.debug("Parsed JSON format: %s", action_dict)
             return action_dict
-    except (json.JSONDecodeError, KeyError, ValueError) as e:
+    except (orjson.JSONDecodeError, KeyError, ValueError) as e:
         logger.debug(f"Failed to parse JSON format: {e}")
 
     # Try to parse structured text format
@@ -65,12 +70,12 @@ def parse_white_agent_response(response_text: str) -> Dict[str, Any]:
                 )
             elif line.startswith("PARAMS:"):
                 params_str = line.replace("PARAMS:", "").strip()
-                result["params"] = json.loads(params_str)
+                result["params"] = orjson.loads(params_str)
 
         if result:
-            logger.debug(f"Parsed structured text format: {result}")
+            logger.debug("Parsed structured text format: %s", result)
             return result
-    except (json.JSONDecodeError, ValueError) as e:
+    except (orjson.JSONDecodeError, ValueError) as e:
         logger.debug(f"Failed to parse structured text format: {e}")
 
     # Default: unparseable response - return error for feedback/retry
@@ -8,8 +8,11 @@ def build_url(host: str, port: int, secure: bool = False) -> str:
     return f"{scheme}://{host}:{port}"
 
 
+_TAG_RE = re.compile(r"<(.*?)>(.*?)</\1>", re.DOTALL)
+
+
 def parse_tags(str_with_tags: str) -> Dict[str, str]:
     """the target str contains tags in the format of <tag_name> ... </tag_name>, parse them out and return a dict"""
 
-    tags = re.findall(r"<(.*?)>(.*?)</\1>", str_with_tags, re.DOTALL)
+    tags = _TAG_RE.findall(str_with_tags)
     return {tag: content.strip() for tag, content in tags}
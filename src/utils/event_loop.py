@@ -0,0 +1,32 @@
+"""
+Event loop selection for entry points.
+
+Coroutines are run on uvloop when it is installed (it is a dependency on
+every platform it supports) and on the stdlib asyncio loop otherwise.
+"""
+
+import asyncio
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+try:
+    import uvloop
+except ImportError:  # e.g. Windows, where uvloop is not available
+    uvloop = None
+
+T = TypeVar("T")
+
+
+def run(main: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine to completion on a new event loop.
+
+    Args:
+        main: Coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    if uvloop is not None:
+        return uvloop.run(main)
+    return asyncio.run(main)
@@ -0,0 +1,75 @@
+"""
+Logging setup for long-running agent processes.
+
+Log records are handed to a queue and written by a QueueListener on a
+background thread, so logger calls made from coroutines never block the
+event loop on stream I/O.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that renders the date/time part of asctime once per second.
+
+    Produces the same "%Y-%m-%d %H:%M:%S,mmm" timestamps as the default
+    formatTime, but only calls localtime/strftime when the second changes.
+    """
+
+    def __init__(self, fmt: str | None = None):
+        super().__init__(fmt)
+        self._cached_second = -1
+        self._cached_prefix = ""
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_prefix = time.strftime(
+                self.default_time_format, self.converter(second)
+            )
+            self._cached_second = second
+        return self.default_msec_format % (self._cached_prefix, record.msecs)
+
+
+def init_logging(level: int = logging.INFO, fmt: str = LOG_FORMAT) -> None:
+    """
+    Configure the root logger to write through a background queue listener.
+
+    Safe to call more than once; only the first call installs handlers.
+
+    Args:
+        level: Root logger level
+        fmt: Format string for emitted records
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    # Written through sys.stderr itself, so records stay in order with other
+    # stderr writers (uvicorn, tracebacks, print)
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(CachedTimeFormatter(fmt))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, handler, respect_handler_level=True
+    )
+    _listener.start()
+    # Drain pending records on interpreter shutdown
+    atexit.register(_listener.stop)
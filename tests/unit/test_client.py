@@ -0,0 +1,35 @@
+"""Unit tests for agentbeats.client helpers."""
+
+import httpx
+from a2a.client.errors import A2AClientHTTPError
+
+from agentbeats.client import is_rate_limit_error
+
+
+class TestIsRateLimitError:
+    """Tests for is_rate_limit_error classification."""
+
+    def test_http_429_is_rate_limit(self):
+        """A2A HTTP 429 counts regardless of message."""
+        assert is_rate_limit_error(A2AClientHTTPError(429, "slow down"))
+
+    def test_http_500_relaying_resource_exhausted_is_rate_limit(self):
+        """A 500 carrying the LLM's RESOURCE_EXHAUSTED error is still retried."""
+        error = A2AClientHTTPError(500, "RESOURCE_EXHAUSTED: quota exceeded")
+        assert is_rate_limit_error(error)
+
+    def test_http_500_without_rate_limit_text_is_not_rate_limit(self):
+        """Other server errors are hard failures."""
+        assert not is_rate_limit_error(A2AClientHTTPError(500, "Internal error"))
+
+    def test_httpx_429_is_rate_limit(self):
+        """httpx status errors are classified by status code."""
+        request = httpx.Request("POST", "http://agent")
+        response = httpx.Response(429, request=request)
+        error = httpx.HTTPStatusError("error", request=request, response=response)
+        assert is_rate_limit_error(error)
+
+    def test_plain_error_matches_text(self):
+        """Non-HTTP errors fall back to matching the message."""
+        assert is_rate_limit_error(RuntimeError("Too Many Requests"))
+        assert not is_rate_limit_error(RuntimeError("connection reset"))
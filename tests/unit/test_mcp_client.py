@@ -106,6 +106,40 @@ class TestMCPBrowserClientLifecycle:
         mock_process.terminate.assert_called_once()
         mock_process.kill.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_reset_browser_closes_and_wipes_profile(
+        self, client, mock_process, tmp_path
+    ):
+        """Test reset_browser() closes the browser and empties its profile dir."""
+        client.server_process = mock_process
+        client._initialized = True
+        client._user_data_dir = str(tmp_path / "profile")
+        (tmp_path / "profile").mkdir()
+        (tmp_path / "profile" / "Cookies").write_text("session")
+
+        with patch.object(client, "call_tool", new_callable=AsyncMock) as call_tool:
+            await client.reset_browser()
+
+        call_tool.assert_awaited_once_with("browser_close")
+        assert (tmp_path / "profile").is_dir()
+        assert list((tmp_path / "profile").iterdir()) == []
+        # Server keeps running for the next task
+        assert client.server_process is mock_process
+        assert client.is_running
+
+    @pytest.mark.asyncio
+    async def test_start_restarts_exited_server(self, client, mock_process):
+        """Test start() replaces a server process that has already exited."""
+        dead_process = MagicMock(spec=subprocess.Popen)
+        dead_process.poll.return_value = 1  # Process exited
+        client.server_process = dead_process
+
+        with patch("subprocess.Popen", return_value=mock_process):
+            with patch.object(client, "_initialize", new_callable=AsyncMock):
+                await client.start()
+
+        assert client.server_process is mock_process
+
 
 class TestMCPBrowserClientToolDiscovery:
     """Test MCP tool discovery methods."""
@@ -136,6 +136,39 @@ class TestGetStepIndex:
 
         assert agent._get_step_index(ctx) == 0
 
+    def test_step_counter_counts_per_session(self):
+        """Counter starts from the event count, then advances per session."""
+        agent = ReliabilityAgent()
+
+        event = MagicMock(spec=Event)
+        event.author = "reliability_agent"
+
+        ctx_a = MagicMock(spec=InvocationContext)
+        ctx_a.session = MagicMock()
+        ctx_a.session.id = "session-a"
+        ctx_a.session.events = [event]
+
+        ctx_b = MagicMock(spec=InvocationContext)
+        ctx_b.session = MagicMock()
+        ctx_b.session.id = "session-b"
+        ctx_b.session.events = []
+
+        assert agent._current_step_index(ctx_a) == 1
+        # Not advanced until the step is answered
+        assert agent._current_step_index(ctx_a) == 1
+        agent._advance_step("session-a", 1)
+        assert agent._current_step_index(ctx_a) == 2
+        assert agent._current_step_index(ctx_b) == 0
+
+    def test_step_counter_forgets_finished_sessions(self):
+        """Answering the last step drops the session's counter."""
+        agent = ReliabilityAgent()
+
+        agent._advance_step("session-a", 0)
+        assert agent._step_counts == {"session-a": 1}
+        agent._advance_step("session-a", len(agent.actions) - 1)
+        assert agent._step_counts == {}
+
 
 class TestExtractRef:
     """Tests for _extract_ref method."""
@@ -189,6 +222,17 @@ class TestExtractRef:
         ref = agent._extract_ref(snapshot, r"T-Centralen \(Stockholm\)")
         assert ref == "s123"
 
+    def test_extract_ref_keyword_line_without_ref(self):
+        """Keyword on a line without a ref is skipped; case is ignored."""
+        agent = ReliabilityAgent()
+        snapshot = """
+        Heading: Från och till
+        Textbox: FRÅN [ref=s7]
+        """
+
+        ref = agent._extract_ref(snapshot, r"[Ff]rån")
+        assert ref == "s7"
+
     def test_extract_ref_various_ref_formats(self):
         """Ref values like s1, s99, s123."""
         agent = ReliabilityAgent()